@@ -0,0 +1,87 @@
+import argparse
+import json
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import pandas as pd
+from ipl_analytics import QUERIES, run_query, dataset, refresh_datasets
+from result_cache import cache_stats
+
+logger = logging.getLogger(__name__)
+
+def to_json(value):
+    # Query results as plain JSON types: frames become lists of row objects (named index levels
+    # included as columns), dicts and lists recurse, numpy scalars and NaN become numbers and null
+    if isinstance(value, pd.DataFrame):
+        if any(name is not None for name in value.index.names):
+            value = value.reset_index()
+        return json.loads(value.to_json(orient='records', date_format='iso'))
+    if isinstance(value, pd.Series):
+        return json.loads(value.to_json(date_format='iso'))
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # GET /                   -> query names with their parameters
+    # GET /stats              -> result cache counters
+    # GET /<query>?name=value -> query result; list parameters repeat the name
+    def do_GET(self):
+        url = urlsplit(self.path)
+        name = url.path.strip('/')
+        if name == '':
+            self.send_json(200, {query: list(spec['params']) for query, spec in QUERIES.items()})
+            return
+        if name == 'stats':
+            self.send_json(200, cache_stats())
+            return
+        if name not in QUERIES:
+            self.send_json(404, {'error': f"unknown query {name!r}"})
+            return
+        try:
+            # Matches appended to the store since the last request are applied first
+            refresh_datasets()
+            result = run_query(name, parse_qs(url.query))
+        except (TypeError, ValueError, KeyError) as error:
+            self.send_json(400, {'error': str(error)})
+            return
+        except Exception:
+            logger.exception("query %s failed", name)
+            self.send_json(500, {'error': "internal error"})
+            return
+        self.send_json(200, to_json(result))
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the analytics queries as JSON over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--preload', nargs='*', default=['matches', 'deliveries'], help="Datasets to build before accepting requests")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for name in args.preload:
+        dataset(name)
+    server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+    print(f"Serving {len(QUERIES)} queries on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,124 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from team_form import build_team_form_log, build_player_form_log, team_form_as_of, team_win_rate_as_of, player_form_as_of
+from win_model import MODEL_WEIGHTS, build_win_model
+from win_replay import build_chase_states, score_chase_states
+
+CALIBRATION_BUCKETS = 10
+
+# Frames shared by each worker process, filled once by init_worker
+worker_data = {}
+
+def init_worker(matches, deliveries):
+    # Everything a point-in-time model reads is indexed once per worker, so each backtested
+    # match costs binary searches and its own window of rows rather than full-table scans
+    worker_data['matches'] = matches
+    worker_data['by_date'] = matches.sort_values('date', kind='stable', ignore_index=True)
+    worker_data['deliveries'] = deliveries
+    worker_data['form_log'] = build_team_form_log(matches, deliveries)
+    worker_data['player_log'] = build_player_form_log(deliveries)
+
+def point_in_time_model(by_date, form_log, player_log, as_of, teams):
+    # Win model built only from matches played before as_of (by_date: matches sorted by date)
+    history = by_date.iloc[:np.searchsorted(by_date['date'].to_numpy(), as_of, side='left')]
+    team_wins = dict(zip(teams, team_win_rate_as_of(form_log, teams, as_of)))
+    team_forms = dict(zip(teams, zip(*team_form_as_of(form_log, teams, as_of))))
+    player_forms = {team: player_form_as_of(form_log, player_log, team, as_of)[:2] for team in teams}
+    return build_win_model(team_wins, team_forms, player_forms, history)
+
+def backtest_season(season, weights=MODEL_WEIGHTS):
+    # Score every second-innings state of a season's decided matches with point-in-time models
+    matches, deliveries, form_log = worker_data['matches'], worker_data['deliveries'], worker_data['form_log']
+    season_matches = matches[(matches['season'] == season) & matches['winner'].notna() & (matches['result'] != 'tie')]
+    states = build_chase_states(matches, deliveries, season_matches['id'])
+    if states.empty:
+        return states
+    winners = season_matches.set_index('id')['winner'].astype(object)
+    states_by_match = dict(tuple(states.groupby('match_id', sort=False)))
+    scored = []
+    for match in season_matches.itertuples():
+        match_states = states_by_match.get(match.id)
+        if match_states is None:
+            continue
+        teams = [str(match.team1), str(match.team2)]
+        win_model = point_in_time_model(worker_data['by_date'], form_log, worker_data['player_log'], match.date, teams)
+        scored.append(score_chase_states(win_model, match_states, weights))
+    if not scored:
+        return states.iloc[0:0]
+    states = pd.concat(scored, ignore_index=True)
+    states['season'] = season
+    states['chasing_won'] = (states['batting_team'] == states['match_id'].map(winners)).astype(int)
+    return states
+
+def score_metrics(probs, outcomes, buckets=CALIBRATION_BUCKETS):
+    # Brier score, log-loss and a reliability table of predicted vs observed win rates
+    probs = np.asarray(probs, dtype=float)
+    outcomes = np.asarray(outcomes, dtype=float)
+    clipped = np.clip(probs, 1e-15, 1 - 1e-15)
+    metrics = {
+        'states': len(probs),
+        'brier': float(np.mean((probs - outcomes) ** 2)) if len(probs) else float('nan'),
+        'log_loss': float(-np.mean(outcomes * np.log(clipped) + (1 - outcomes) * np.log(1 - clipped))) if len(probs) else float('nan')
+    }
+    bucket = np.minimum((probs * buckets).astype(int), buckets - 1)
+    calibration = pd.DataFrame({'bucket': bucket, 'predicted': probs, 'observed': outcomes}).groupby('bucket').agg(
+        states=('predicted', 'size'),
+        mean_predicted=('predicted', 'mean'),
+        observed_rate=('observed', 'mean')
+    )
+    calibration.index = [f"{b / buckets:.1f}-{(b + 1) / buckets:.1f}" for b in calibration.index]
+    return metrics, calibration
+
+def run_backtest(matches, deliveries, seasons=None, weights=MODEL_WEIGHTS, workers=None):
+    # Seasons are independent given the point-in-time models, so each one runs in its own process
+    if seasons is None:
+        seasons = sorted(matches['season'].dropna().unique())
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(matches, deliveries)) as pool:
+        results = list(pool.map(backtest_season, seasons, [weights] * len(seasons)))
+    results = [r for r in results if not r.empty]
+    if not results:
+        # No decided chases in these seasons: nothing was scored
+        overall, calibration = score_metrics([], [])
+        return overall, calibration, pd.DataFrame(columns=['states', 'brier', 'log_loss'], index=pd.Index([], name='season'))
+    states = pd.concat(results, ignore_index=True)
+    states = states[states['chasing_win_prob'].notna()]
+
+    overall, calibration = score_metrics(states['chasing_win_prob'], states['chasing_won'])
+    per_season = pd.DataFrame([
+        {'season': season, **score_metrics(group['chasing_win_prob'], group['chasing_won'])[0]}
+        for season, group in states.groupby('season', sort=True)
+    ]).set_index('season')
+    return overall, calibration, per_season
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Backtest the live win-probability model on historical chases")
+    parser.add_argument('--seasons', nargs='*', help="Seasons to replay (default: all)")
+    parser.add_argument('--weights', help="Comma-separated history,team_form,player_form,match_situation,external weights")
+    parser.add_argument('--workers', type=int, help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    from ingest import read_frames
+    frames = read_frames()
+    if args.seasons:
+        available = [str(season) for season in frames['matches']['season'].dropna().unique()]
+        unknown = [season for season in args.seasons if season not in available]
+        if unknown:
+            parser.error(f"unknown season(s) {', '.join(unknown)}; available: {', '.join(sorted(available))}")
+    weights = MODEL_WEIGHTS
+    if args.weights:
+        values = [float(w) for w in args.weights.split(',')]
+        if len(values) != len(MODEL_WEIGHTS):
+            parser.error(f"--weights needs {len(MODEL_WEIGHTS)} values")
+        weights = dict(zip(MODEL_WEIGHTS, values))
+
+    start = time.perf_counter()
+    overall, calibration, per_season = run_backtest(frames['matches'], frames['deliveries'], args.seasons, weights, args.workers)
+    print(f"Weights: {weights}")
+    print(f"States: {overall['states']}  Brier: {overall['brier']:.4f}  Log-loss: {overall['log_loss']:.4f}  ({time.perf_counter() - start:.1f}s)")
+    print("\nCalibration")
+    print(calibration.to_string())
+    print("\nPer season")
+    print(per_season.to_string())
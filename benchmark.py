@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import resource
+import time
+import tracemalloc
+import pandas as pd
+from synthetic_data import dataset_dir, generate, write_dataset
+
+def measure(fn, repeat=1):
+    # Best wall time over repeat untraced runs, then the peak traced allocation of one more run in
+    # MB: tracemalloc slows allocation-heavy code down too much to time it while tracing
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak / 2 ** 20
+
+def query_params(matches, built):
+    # Parameters for every query of the query layer, picked from the data: the busiest pairing,
+    # its latest season and meeting, and the top run scorers and wicket takers
+    from cube import rollup
+    batters = rollup(built['cube'], ['batter'], ['runs'])['runs'].nlargest(2).index
+    bowlers = rollup(built['cube'], ['bowler'], ['bowler_wickets'])['bowler_wickets'].nlargest(2).index
+    team1, team2 = [str(team) for team in matches['team1'].value_counts().index[:2]]
+    rivalry = matches[matches['team1'].isin([team1, team2]) & matches['team2'].isin([team1, team2])]
+    season = str(rivalry['season'].iloc[-1])
+    city = str(matches.loc[matches['team1'] == team1, 'city'].mode().iloc[0])
+    return {
+        'season_rivalry': {'team1': team1, 'team2': team2, 'season': season},
+        'wins_by_season': {'team1': team1, 'team2': team2},
+        'season_wickets': {'bowler1': bowlers[0], 'bowler2': bowlers[1]},
+        'season_summary': {'season_year': season, 'team_name': team1, 'player_name': batters[0]},
+        'head_to_head': {'team1': team1, 'team2': team2},
+        'top_strike_rates': {},
+        'highest_targets': {},
+        'player_vs_team': {'player': batters[0], 'opponent_team': team2},
+        'player_comparison': {'player1': batters[0], 'player2': batters[1], 'opponent_team': team2},
+        'team_performance': {},
+        'matchup_tables': {'batsman': batters[0], 'bowler': bowlers[0]},
+        'batsman_matchups': {'batsman': batters[0], 'bowlers': list(bowlers)},
+        'team_form': {'team': team1},
+        'win_probability': {
+            'batting_team': team1, 'bowling_team': team2, 'host_city': city, 'score': 125.0,
+            'overs_completed': 16.0, 'wickets_out': 2, 'target': 151.0
+        },
+        'match_replay': {'match_id': int(rivalry['id'].iloc[-1])},
+        # Against whatever live feed the data directory has, usually none
+        'live_matches': {},
+        'live_match': {'match_id': int(rivalry['id'].iloc[-1])}
+    }
+
+def benchmark_cases(frames, built):
+    # (name, callable) for every query of the query layer behind the feature pages and the JSON
+    # API, run uncached against the built datasets
+    import ipl_analytics
+    from ipl_analytics import QUERIES, dataset, new_dataset_generation
+
+    # The query layer's process datasets start from the ones just built; the rest build on use
+    ipl_analytics.datasets.clear()
+    new_dataset_generation()
+    ipl_analytics.datasets.update({'frames': frames, **{name: value for name, value in built.items() if name in ipl_analytics.DATASET_BUILDERS}})
+    params = query_params(frames['matches'], built)
+    missing = set(QUERIES) - set(params)
+    if missing:
+        raise KeyError(f"no benchmark parameters for {', '.join(sorted(missing))}")
+    cases = []
+    for name, spec in QUERIES.items():
+        # The undecorated query, so repeats are not served from the result cache
+        query = getattr(spec['query'], '__wrapped__', spec['query'])
+        inputs = [dataset(dataset_name) for dataset_name in spec['datasets']]
+        cases.append((name, lambda query=query, inputs=inputs, kwargs=params[name]: query(*inputs, **kwargs)))
+    return cases
+
+def run_benchmarks(repeat=1):
+    # Times the cold load, every derived dataset build and every page query in the current directory
+    from ingest import build_frames, read_frames, write_frames
+    from player_index import build_player_indexes
+    from season_index import build_season_indexes
+    from cube import build_cube
+    from leaderboard import build_leaderboards
+    from matchup_index import build_matchup_index
+    from team_form import build_team_form_log
+    from innings import build_innings_tables
+    from standings import build_standings
+    from model_artifacts import build_prediction_artifacts
+
+    results = []
+    def record(name, fn, times=repeat):
+        value, seconds, peak_mb = measure(fn, times)
+        # Allocations made outside Python (e.g. by Arrow) only show up in the process high-water
+        # mark, which is cumulative: it covers this step and every one before it
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        results.append({'name': name, 'seconds': round(seconds, 4), 'peak_mb': round(peak_mb, 1), 'cumulative_max_rss_mb': round(max_rss_mb, 1)})
+        print(f"  {name:32s} {seconds:9.3f}s {peak_mb:9.1f} MB peak {max_rss_mb:9.1f} MB rss so far", flush=True)
+        return value
+
+    frames = record('load_data (from CSV)', build_frames, 1)
+    write_frames(frames)
+    frames = record('load_data (columnar store)', read_frames)
+    matches, deliveries = frames['matches'], frames['deliveries']
+
+    built = {}
+    built['season_index'] = record('build_season_indexes', lambda: build_season_indexes(frames))
+    built['player_index'] = record('build_player_indexes', lambda: build_player_indexes(deliveries))
+    built['cube'] = record('build_cube', lambda: build_cube(deliveries))
+    built['leaderboards'] = record('build_leaderboards', lambda: build_leaderboards(built['cube'], sorted(matches['season'].unique())))
+    built['matchup_index'] = record('build_matchup_index', lambda: build_matchup_index(built['cube']))
+    built['team_form_log'] = record('build_team_form_log', lambda: build_team_form_log(matches, deliveries))
+    built['innings'] = record('build_innings_tables', lambda: build_innings_tables(deliveries))
+    built['standings'] = record('build_standings', lambda: build_standings(matches))
+    built['prediction_artifacts'] = record('prepare_training_data', lambda: build_prediction_artifacts(matches, deliveries, built['team_form_log']))
+
+    for name, fn in benchmark_cases(frames, built):
+        record(name, fn)
+    return results
+
+def compare(results, baseline, threshold):
+    # Side-by-side with a previous run; anything slower than threshold x is flagged
+    previous = {row['name']: row for row in baseline}
+    for row in results:
+        old = previous.get(row['name'])
+        if old is None or old['seconds'] == 0:
+            continue
+        ratio = row['seconds'] / old['seconds']
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f"  {row['name']:32s} {old['seconds']:9.3f}s -> {row['seconds']:9.3f}s ({ratio:.2f}x){flag}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time data loading and every page computation on synthetic data")
+    parser.add_argument('--scale', type=int, nargs='+', default=[1], help="Dataset sizes as multiples of IPL history, e.g. 1 10 100")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per query, the best time is kept")
+    parser.add_argument('--out', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against a JSON file written by an earlier --out")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    template = pd.read_csv('./data/matches.csv')
+    root = os.getcwd()
+    report = {}
+    for scale in args.scale:
+        # Each scale gets its own data directory; the loaders read ./data relative to it
+        out_dir = os.path.join(root, dataset_dir(scale))
+        if not os.path.exists(os.path.join(out_dir, 'data', 'deliveries.csv')):
+            print(f"Generating x{scale} dataset in {out_dir}", flush=True)
+            write_dataset(out_dir, *generate(template, scale))
+        print(f"x{scale}")
+        os.chdir(out_dir)
+        report[f'x{scale}'] = run_benchmarks(args.repeat)
+        os.chdir(root)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for scale, results in report.items():
+            if scale in baseline:
+                print(f"{scale} vs baseline")
+                compare(results, baseline[scale], args.threshold)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
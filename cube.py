@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from data_store import share_categories
+
+# Finest grain the pages ever group by; every roll-up is a sum over some of these
+CUBE_DIMENSIONS = ['batter', 'bowler', 'batting_team', 'bowling_team', 'season', 'venue', 'inning']
+CUBE_MEASURES = ['runs', 'total_runs', 'bowler_runs', 'balls', 'deliveries', 'dismissals', 'bowler_wickets', 'fours', 'sixes']
+# Coarser roll-ups of the cells kept alongside them for the page groupings, each led by the
+# dimension its queries filter on so that filter is a binary search instead of a scan
+CUBE_ROLLUPS = {
+    'season_batter': ['season', 'batter', 'batting_team', 'bowling_team'],
+    'season_bowler': ['season', 'bowler', 'batting_team', 'bowling_team'],
+    'bowler_season': ['bowler', 'season', 'inning']
+}
+
+def build_cube(deliveries):
+    # Additive totals per cube cell, sorted so the leading dimensions are contiguous
+    flags = deliveries[CUBE_DIMENSIONS].assign(
+        runs=deliveries['batsman_runs'].astype('int32'),
+        total_runs=deliveries['total_runs'].astype('int32'),
+        bowler_runs=deliveries['bowler_run'].astype('int32'),
+        balls=deliveries['extras_type'].ne('wides').astype('int32'),
+        deliveries=np.ones(len(deliveries), dtype='int32'),
+        dismissals=deliveries['is_wicket'].astype('int32'),
+        bowler_wickets=deliveries['isBowlerWicket'].astype('int32'),
+        fours=(deliveries['batsman_runs'] == 4).astype('int32'),
+        sixes=(deliveries['batsman_runs'] == 6).astype('int32')
+    )
+    cells = flags.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)[CUBE_MEASURES].sum().astype('int64').sort_index()
+    # The finest cells plus each roll-up, every table sorted by its index
+    cube = {'cells': cells}
+    for name, dimensions in CUBE_ROLLUPS.items():
+        cube[name] = cells.groupby(level=dimensions, observed=True, dropna=False).sum().sort_index()
+    return cube
+
+def add_totals(table, other, level='season'):
+    # Cell-by-cell sum of two tables of additive totals with the same index levels and columns.
+    # Only the cells sharing a value of level with other (e.g. its seasons) can change, so only
+    # those are regrouped.
+    table = share_categories(table, other)
+    touched = table.index.get_level_values(level).isin(other.index.get_level_values(level).unique())
+    merged = pd.concat([table[touched], other]).groupby(level=list(table.index.names), observed=True, dropna=False).sum()
+    return pd.concat([table[~touched], merged]).astype('int64').sort_index()
+
+def append_cube(cube, deliveries):
+    # The cube after adding a batch of deliveries: only the batch is aggregated
+    batch = build_cube(deliveries)
+    return {name: add_totals(table, batch[name]) for name, table in cube.items()}
+
+def cube_table(cube, dimensions, filters):
+    # The table to answer from: among those holding every dimension needed, one whose leading
+    # dimension is filtered, then the one with the fewest rows
+    candidates = [table for table in cube.values() if set(dimensions) <= set(table.index.names)]
+    return min(candidates, key=lambda table: (table.index.names[0] not in filters, len(table)))
+
+def slice_cube(table, **filters):
+    # Keep the rows of a cube table matching every filter; a filter value is one member or a
+    # list of members. The leading level is sorted, so its filter is a binary search for each
+    # member; the others match on the index level codes of what is left, never row by row.
+    leading = table.index.names[0]
+    if leading in filters:
+        members = [member for member in np.atleast_1d(filters[leading]) if member in table.index.levels[0]]
+        if not members:
+            return table.iloc[0:0]
+        table = table.iloc[table.index.get_locs([members])]
+    mask = np.ones(len(table), dtype=bool)
+    for dim, values in filters.items():
+        if dim == leading:
+            continue
+        level = table.index.names.index(dim)
+        members = table.index.levels[level].get_indexer(pd.Index(np.atleast_1d(values)))
+        mask &= np.isin(table.index.codes[level], members[members >= 0])
+    return table[mask]
+
+def rollup(cube, by=None, measures=None, **filters):
+    # Sum the measures over every dimension not in by, after applying the filters.
+    # With no by the grand totals come back as a Series.
+    table = cube_table(cube, list(by or []) + list(filters), filters)
+    cells = slice_cube(table, **filters) if filters else table
+    measures = measures or CUBE_MEASURES
+    if not by:
+        return cells[measures].sum()
+    return cells.groupby(level=by, observed=True, dropna=False)[measures].sum()
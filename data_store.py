@@ -0,0 +1,269 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Bump when the layout or typing of the stored frames changes so old stores are rebuilt
+STORE_VERSION = 5
+MANIFEST = 'manifest.json'
+# A store lock older than this many seconds is taken to be left over by a crashed writer
+STORE_LOCK_STALE = 600
+
+# Columns kept as categoricals (players, teams, venues, dismissal details)
+CATEGORICAL_COLUMNS = [
+    'season', 'city', 'match_type', 'player_of_match', 'venue', 'team1', 'team2', 'toss_winner',
+    'toss_decision', 'winner', 'result', 'super_over', 'method', 'umpire1', 'umpire2',
+    'batting_team', 'bowling_team', 'batter', 'bowler', 'non_striker', 'extras_type',
+    'player_dismissed', 'dismissal_kind', 'fielder'
+]
+
+# Numeric columns narrowed to the smallest int that holds them
+SMALL_INT_COLUMNS = {
+    'id': 'int32',
+    'match_id': 'int32',
+    'inning': 'int8',
+    'over': 'int8',
+    'ball': 'int8',
+    'batsman_runs': 'int8',
+    'extra_runs': 'int8',
+    'total_runs': 'int8',
+    'is_wicket': 'int8',
+    'isBowlerWicket': 'int8',
+    'bowler_run': 'int8'
+}
+
+def csv_dtypes(path):
+    # dtype mapping for pd.read_csv so columns are parsed straight into the compact schema
+    columns = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: 'category' for col in columns if col in CATEGORICAL_COLUMNS}
+    dtypes.update({col: dtype for col, dtype in SMALL_INT_COLUMNS.items() if col in columns})
+    return dtypes
+
+def compact_frame(df):
+    # Cast any derived columns that are still object/int64 into the store schema. Categories are
+    # put in sorted order (read_csv leaves them in chunk order), the same as any read of the store.
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+        elif col in SMALL_INT_COLUMNS and df[col].notna().all():
+            df[col] = df[col].astype(SMALL_INT_COLUMNS[col])
+    return sorted_categories(df)
+
+@contextmanager
+def store_lock(store_dir, timeout=STORE_LOCK_STALE):
+    # Writers of a store take turns: creating a directory is atomic on every platform, so whoever
+    # creates <store>.lock holds the lock until it removes it
+    lock_dir = f'{store_dir}.lock'
+    os.makedirs(os.path.dirname(os.path.abspath(lock_dir)), exist_ok=True)
+    while True:
+        try:
+            os.mkdir(lock_dir)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_dir) > timeout:
+                    os.rmdir(lock_dir)
+                    continue
+            except OSError:
+                continue  # Released in the meantime
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.rmdir(lock_dir)
+
+def wait_for_writer(store_dir, timeout=STORE_LOCK_STALE):
+    # Returns once no writer holds the store lock, e.g. when a reader finds the store directory
+    # missing because write_store is swapping in a new one. Returns whether it had to wait.
+    waited = False
+    deadline = time.time() + timeout
+    while os.path.exists(f'{store_dir}.lock') and time.time() < deadline:
+        waited = True
+        time.sleep(0.05)
+    return waited
+
+def store_is_fresh(store_dir, sources):
+    manifest_path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(manifest_path) and not (wait_for_writer(store_dir) and os.path.exists(manifest_path)):
+        return False
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if manifest.get('version') != STORE_VERSION:
+        return False
+    built_at = os.path.getmtime(manifest_path)
+    return all(os.path.getmtime(src) <= built_at for src in sources)
+
+def read_manifest(store_dir, wait=True):
+    try:
+        with open(os.path.join(store_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # Between the two renames of a store swap there is no store: wait for the writer (not
+        # when the caller is the writer holding the lock)
+        if not wait or not wait_for_writer(store_dir):
+            raise
+    with open(os.path.join(store_dir, MANIFEST)) as f:
+        return json.load(f)
+
+def write_manifest(store_dir, manifest):
+    # Replace the manifest in one step so readers see either the old or the new set of files
+    tmp_path = os.path.join(store_dir, f'{MANIFEST}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST))
+
+def partition_path(name, column, key):
+    # Relative file of one partition, e.g. deliveries/season=2007-08.parquet
+    return os.path.join(name, f"{column}={str(key).replace('/', '-')}.parquet")
+
+def concat_frames(dfs):
+    # Stack frames of the same schema, unifying each categorical column's categories first
+    dfs = list(dfs)
+    for col in dfs[0].columns:
+        if all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in dfs):
+            categories = dfs[0][col].cat.categories
+            for df in dfs[1:]:
+                categories = categories.union(df[col].cat.categories)
+            dfs = [df.assign(**{col: df[col].cat.set_categories(categories)}) for df in dfs]
+    return sorted_categories(pd.concat(dfs, ignore_index=True))
+
+def share_categories(df, like):
+    # df with every categorical column and index level recoded to the categories of the same
+    # column or level in like, so the two concatenate without falling back to object
+    df = df.assign(**{
+        col: df[col].cat.set_categories(like[col].cat.categories)
+        for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype) and col in like
+    })
+    like_levels = dict(zip(like.index.names, like.index.levels if isinstance(like.index, pd.MultiIndex) else [like.index]))
+    levels = [
+        level.set_categories(like_levels[name].categories)
+        if isinstance(level, pd.CategoricalIndex) and isinstance(like_levels.get(name), pd.CategoricalIndex) else level
+        for name, level in zip(df.index.names, df.index.levels if isinstance(df.index, pd.MultiIndex) else [df.index])
+    ]
+    df.index = df.index.set_levels(levels, verify_integrity=False) if isinstance(df.index, pd.MultiIndex) else levels[0]
+    return df
+
+def sorted_categories(df):
+    # Partitions each carry only the categories they use; put the unified set back in sorted order
+    # so group and sort order match a frame read in one piece
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and not df[col].cat.categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+def read_partitions(store_dir, entry, keys=None):
+    # Concatenate the partitions of one frame in key order, only those in keys when given
+    keys = entry['partitions'] if keys is None else [key for key in entry['partitions'] if key in keys]
+    tables = [pq.read_table(os.path.join(store_dir, entry['partitions'][key])) for key in keys]
+    if not tables:
+        # No rows, but the frame's columns and types
+        first = next(iter(entry['partitions'].values()))
+        tables = [pq.read_schema(os.path.join(store_dir, first)).empty_table()]
+    # Partitions written at different times can differ in schema details (an all-null column,
+    # narrower dictionary indices); permissive promotion unifies them
+    return sorted_categories(pa.concat_tables(tables, promote_options='permissive').to_pandas())
+
+def read_store(store_dir, names, partitions=None, wait=True):
+    # Frames by name; partitions optionally restricts partitioned frames to those keys (e.g. seasons).
+    # A store swapped out by write_store mid-read loses its files: read the new one instead.
+    # Writers holding the store lock pass wait=False, as nothing can swap the store under them.
+    if not wait:
+        return read_store_files(store_dir, names, partitions, wait)
+    try:
+        return read_store_files(store_dir, names, partitions)
+    except FileNotFoundError:
+        wait_for_writer(store_dir)
+        return read_store_files(store_dir, names, partitions)
+
+def read_store_files(store_dir, names, partitions=None, wait=True):
+    manifest = read_manifest(store_dir, wait)
+    frames = {}
+    for name in names:
+        entry = manifest['frames'][name]
+        if 'partitions' in entry:
+            frames[name] = read_partitions(store_dir, entry, partitions)
+        else:
+            frames[name] = pd.read_parquet(os.path.join(store_dir, entry['file']))
+    return frames
+
+def write_partitions(store_dir, name, df, column):
+    # One file per value of column, returned as {key: relative path} in key order
+    os.makedirs(os.path.join(store_dir, name), exist_ok=True)
+    partitions = {}
+    for key, part in df.groupby(column, observed=True, sort=True):
+        partitions[str(key)] = partition_path(name, column, key)
+        path = os.path.join(store_dir, partitions[str(key)])
+        part.to_parquet(f'{path}.tmp', index=False)
+        os.replace(f'{path}.tmp', path)
+    return partitions
+
+def write_store(store_dir, frames, partition_on=None):
+    # Write into a temporary directory of this writer's own and swap it in so readers never see a
+    # half-written store. Frames named in partition_on are split into one file per value of the
+    # given column.
+    partition_on = partition_on or {}
+    parent = os.path.dirname(os.path.abspath(store_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f'{os.path.basename(store_dir)}.tmp-')
+    try:
+        os.chmod(tmp_dir, 0o755)
+        entries = {}
+        for name, df in frames.items():
+            df = compact_frame(df)
+            if name in partition_on:
+                column = partition_on[name]
+                entries[name] = {'partition_on': column, 'partitions': write_partitions(tmp_dir, name, df, column)}
+            else:
+                entries[name] = {'file': f'{name}.parquet'}
+                df.to_parquet(os.path.join(tmp_dir, entries[name]['file']), index=False)
+        # built identifies this store, revision counts the updates made to it since
+        write_manifest(tmp_dir, {'version': STORE_VERSION, 'built': time.time(), 'revision': 0, 'frames': entries})
+        # The old store is renamed out of the way, never deleted in place, and the swap is done
+        # under the store lock so concurrent writers and update_store take turns
+        old_dir = f'{store_dir}.old-{uuid.uuid4().hex}'
+        with store_lock(store_dir):
+            if os.path.exists(store_dir):
+                os.replace(store_dir, old_dir)
+            os.replace(tmp_dir, store_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def update_store(store_dir, frames):
+    # Replace the partitions each partitioned frame covers (e.g. the current season) and rewrite
+    # the small unpartitioned frames, leaving every other partition untouched. Each partition
+    # records the revision that last wrote it so readers can load just what changed.
+    with store_lock(store_dir):
+        return update_store_files(store_dir, frames)
+
+def update_store_files(store_dir, frames):
+    manifest = read_manifest(store_dir, wait=False)
+    manifest['revision'] += 1
+    for name, df in frames.items():
+        entry = manifest['frames'][name]
+        df = compact_frame(df)
+        if 'partitions' in entry:
+            partitions = write_partitions(store_dir, name, df, entry['partition_on'])
+            entry['partitions'] = dict(sorted({**entry['partitions'], **partitions}.items()))
+            entry['revisions'] = {**entry.get('revisions', {}), **{key: manifest['revision'] for key in partitions}}
+        else:
+            path = os.path.join(store_dir, entry['file'])
+            df.to_parquet(f'{path}.tmp', index=False)
+            os.replace(f'{path}.tmp', path)
+    write_manifest(store_dir, manifest)
+    return manifest['revision']
+
+def changed_partitions(manifest, name, revision):
+    # Keys of the partitions of frame name written after revision
+    revisions = manifest['frames'][name].get('revisions', {})
+    return [key for key, written in revisions.items() if written > revision]
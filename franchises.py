@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# Earlier names of renamed franchises, mapped to the name they play under now
+FRANCHISE_RENAMES = {
+    'Delhi Daredevils': 'Delhi Capitals',
+    'Kings XI Punjab': 'Punjab Kings',
+    'Royal Challengers Bangalore': 'Royal Challengers Bengaluru',
+    'Rising Pune Supergiants': 'Rising Pune Supergiant'
+}
+
+# Team-name columns of each frame that get an integer franchise code column alongside, e.g. winner_code
+TEAM_CODE_COLUMNS = {
+    'matches': ['team1', 'team2', 'toss_winner', 'winner'],
+    'deliveries': ['batting_team', 'bowling_team']
+}
+
+# Code for a missing team, e.g. the winner of a no-result
+NO_TEAM = -1
+
+def team_seasons(matches):
+    # First match date and first/last season of every team name in matches
+    sides = pd.concat([
+        matches[['date', 'season', side]].rename(columns={side: 'team'}).astype({'team': object, 'season': object})
+        for side in ['team1', 'team2']
+    ]).dropna(subset=['team'])
+    return sides.groupby('team').agg(
+        first_match=('date', 'min'),
+        first_season=('season', 'min'),
+        last_season=('season', 'max')
+    ).reset_index()
+
+def number_franchises(names, first_code=0):
+    # Codes for the franchises of names in order of their first match, starting at first_code
+    debut = names.groupby('franchise')['first_match'].min().reset_index().sort_values(['first_match', 'franchise'])
+    return pd.Series(np.arange(first_code, first_code + len(debut), dtype='int16'), index=debut['franchise'])
+
+def build_lineage(matches):
+    # One row per team name in the data with the franchise it belongs to and that franchise's
+    # code. Codes follow each franchise's first match, so appending later matches never renumbers
+    # existing franchises.
+    names = team_seasons(matches)
+    names['franchise'] = names['team'].map(FRANCHISE_RENAMES).fillna(names['team'])
+    names['code'] = names['franchise'].map(number_franchises(names)).astype('int16')
+    return names[['code', 'franchise', 'team', 'first_season', 'last_season']].sort_values(['code', 'first_season']).reset_index(drop=True)
+
+def extend_lineage(lineage, matches):
+    # The lineage after appending matches: known names widen their seasons, new names of a known
+    # franchise take its code and new franchises are numbered after every existing one
+    batch = team_seasons(matches)
+    names = pd.concat([lineage[['team', 'first_season', 'last_season']], batch.drop(columns='first_match')])
+    names = names.groupby('team').agg(first_season=('first_season', 'min'), last_season=('last_season', 'max')).reset_index()
+    names['franchise'] = names['team'].map(FRANCHISE_RENAMES).fillna(names['team'])
+    codes = lineage.groupby('franchise')['code'].first()
+    batch['franchise'] = batch['team'].map(FRANCHISE_RENAMES).fillna(batch['team'])
+    debuts = batch[~batch['franchise'].isin(codes.index)]
+    codes = pd.concat([codes, number_franchises(debuts, int(codes.max()) + 1 if len(codes) else 0)])
+    names['code'] = names['franchise'].map(codes).astype('int16')
+    return names[['code', 'franchise', 'team', 'first_season', 'last_season']].sort_values(['code', 'first_season']).reset_index(drop=True)
+
+def team_codes(lineage, teams):
+    # Franchise code for every team name in teams, NO_TEAM where the name is missing or unknown
+    positions = pd.Categorical(teams, categories=lineage['team']).codes
+    return np.where(positions >= 0, lineage['code'].to_numpy()[positions], NO_TEAM).astype('int16')
+
+def same_franchise(lineage, team1, team2):
+    # True when two team names are the same franchise, e.g. one of its old names and its current one
+    code1, code2 = team_codes(lineage, [team1, team2])
+    return team1 == team2 or (code1 == code2 and code1 != NO_TEAM)
+
+def franchise_names(lineage):
+    # team name -> current franchise name
+    return dict(zip(lineage['team'], lineage['franchise']))
@@ -0,0 +1,197 @@
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from data_store import csv_dtypes, compact_frame, concat_frames, store_is_fresh, read_manifest, read_store, write_store, store_lock, update_store_files, changed_partitions
+from franchises import TEAM_CODE_COLUMNS, build_lineage, extend_lineage, team_codes
+
+logger = logging.getLogger(__name__)
+
+MATCHES_CSV = './data/matches.csv'
+DELIVERIES_CSV = './data/deliveries.csv'
+STORE_DIR = './data/store'
+STORE_FRAMES = ['matches', 'deliveries', 'franchises']
+# Frames stored as one file per season, so a season can be read or added on its own
+STORE_PARTITIONS = {'matches': 'season', 'deliveries': 'season'}
+
+BOWLER_DISMISSALS = ['caught', 'bowled', 'lbw', 'stumped', 'caught and bowled', 'hit wicket']
+
+def merge_stage(frames):
+    matches = frames['matches']
+    # Merge match details once so every page reads season, venue and teams from the same table
+    deliveries = frames['deliveries'].merge(matches[['id', 'season', 'venue', 'team1', 'team2']], left_on='match_id', right_on='id', how='left')
+    frames['deliveries'] = deliveries.drop(columns='id')
+
+def team_resolution_stage(frames):
+    deliveries = frames['deliveries']
+    # Compare as plain arrays: the deliveries and matches team columns carry different categories
+    batting_team = deliveries['batting_team'].to_numpy(dtype=object)
+    team1 = deliveries.pop('team1').to_numpy(dtype=object)
+    team2 = deliveries.pop('team2').to_numpy(dtype=object)
+    batting_team = np.where(batting_team == team1, team1, team2)
+    deliveries['batting_team'] = batting_team
+    deliveries['bowling_team'] = np.where(batting_team == team1, team2, team1)
+
+def bowler_wicket_stage(frames):
+    deliveries = frames['deliveries']
+    deliveries['isBowlerWicket'] = deliveries['is_wicket'].where(deliveries['dismissal_kind'].isin(BOWLER_DISMISSALS), 0)
+
+def bowler_run_stage(frames):
+    deliveries = frames['deliveries']
+    # Calculate bowler runs (exclude legbyes from total_runs)
+    deliveries['bowler_run'] = deliveries['total_runs'] - deliveries['extra_runs'].where(deliveries['extras_type'] == 'legbyes', 0)
+
+def franchise_stage(frames):
+    # Resolve renamed franchises once: a franchise code next to every team column plus the lineage table.
+    # A batch appended to existing data extends the existing lineage so known codes never change.
+    if 'franchises' in frames:
+        lineage = extend_lineage(frames['franchises'], frames['matches'])
+    else:
+        lineage = build_lineage(frames['matches'])
+    for name, columns in TEAM_CODE_COLUMNS.items():
+        for col in columns:
+            frames[name][f'{col}_code'] = team_codes(lineage, frames[name][col])
+    frames['franchises'] = lineage
+
+INGEST_STAGES = [
+    ('merge', merge_stage),
+    ('team_resolution', team_resolution_stage),
+    ('bowler_wicket', bowler_wicket_stage),
+    ('bowler_run', bowler_run_stage),
+    ('franchise', franchise_stage)
+]
+
+def run_ingest(matches, deliveries, franchises=None):
+    # Run every stage in order on a shared dict of frames, timing each one.
+    # The result is a single enriched deliveries table alongside matches and the franchise lineage.
+    frames = {'matches': matches, 'deliveries': deliveries}
+    if franchises is not None:
+        frames['franchises'] = franchises
+    timings = {}
+    for name, stage in INGEST_STAGES:
+        start = time.perf_counter()
+        stage(frames)
+        timings[name] = time.perf_counter() - start
+        logger.info("ingest stage %s took %.3fs", name, timings[name])
+    return frames, timings
+
+def build_frames():
+    start = time.perf_counter()
+    matches = pd.read_csv(MATCHES_CSV, dtype=csv_dtypes(MATCHES_CSV))
+    deliveries = pd.read_csv(DELIVERIES_CSV, dtype=csv_dtypes(DELIVERIES_CSV))
+    logger.info("ingest stage read_csv took %.3fs", time.perf_counter() - start)
+    frames, _ = run_ingest(matches, deliveries)
+    return store_order({name: compact_frame(frames[name]) for name in STORE_FRAMES})
+
+def store_order(frames):
+    # Same season-by-season row order as a read of the partitioned store
+    for name, column in STORE_PARTITIONS.items():
+        frames[name] = frames[name].sort_values(column, kind='stable', ignore_index=True)
+    return frames
+
+def write_frames(frames):
+    write_store(STORE_DIR, frames, STORE_PARTITIONS)
+
+def read_frames(names=STORE_FRAMES, seasons=None):
+    # Use the compiled columnar store when it is newer than the CSVs, otherwise rebuild it.
+    # seasons restricts the season-partitioned frames to those seasons.
+    if store_is_fresh(STORE_DIR, [MATCHES_CSV, DELIVERIES_CSV]):
+        return read_store(STORE_DIR, names, seasons)
+    frames = build_frames()
+    try:
+        write_frames(frames)
+    except OSError:
+        pass  # Read-only deployments still work, they just rebuild on every cold start
+    if seasons is not None:
+        for name, column in STORE_PARTITIONS.items():
+            frames[name] = frames[name][frames[name][column].isin(seasons)].reset_index(drop=True)
+    return {name: frames[name] for name in names}
+
+
+def ingest_batch(frames, matches, deliveries):
+    # Enrich a batch of new matches and their deliveries (CSV schema) against already ingested
+    # frames: only the batch goes through the stages, against the existing franchise lineage.
+    # Matches already in frames are rejected rather than double counted.
+    repeated = np.intersect1d(matches['id'], frames['matches']['id'])
+    if len(repeated):
+        raise ValueError(f"matches already ingested: {', '.join(map(str, repeated[:10]))}")
+    unknown = np.setdiff1d(deliveries['match_id'], matches['id'])
+    if len(unknown):
+        raise ValueError(f"deliveries for matches not in the batch: {', '.join(map(str, unknown[:10]))}")
+    # Seasons are labels like 2019 or 2007/08 even when a batch was parsed without the CSV dtypes
+    matches = matches.astype({'season': str})
+    batch, _ = run_ingest(compact_frame(matches), compact_frame(deliveries), frames['franchises'])
+    return store_order({name: compact_frame(batch[name]) for name in STORE_FRAMES})
+
+def appends_at_end(frames, batch):
+    # Both are in season order, so a batch from the latest loaded season on goes after every row
+    return all(
+        str(batch[name][column].iloc[0]) >= str(frames[name][column].iloc[-1])
+        for name, column in STORE_PARTITIONS.items() if len(batch[name]) and len(frames[name])
+    )
+
+def append_frames(frames, batch):
+    # Frames with an enriched batch added, in the row order a read of the updated store returns
+    merged = {name: concat_frames([frames[name], batch[name]]) for name in STORE_PARTITIONS}
+    merged['franchises'] = batch['franchises']
+    return merged if appends_at_end(frames, batch) else store_order(merged)
+
+def append_csv(path, df):
+    # Add rows to a source CSV in its own column order, so a later full rebuild sees them too
+    columns = pd.read_csv(path, nrows=0).columns
+    df[columns].to_csv(path, mode='a', header=False, index=False)
+
+def append_batch(matches, deliveries):
+    # Incremental ingestion: enrich a batch of new matches, add it to the source CSVs and rewrite
+    # only the store partitions of the seasons it touches. Returns the enriched batch.
+    # Only those seasons are read, which is also where a match sent twice would already be.
+    # Reading, checking and writing happen under the store lock, so concurrent appends to the
+    # same season take turns and each one extends what the previous one wrote.
+    if not store_is_fresh(STORE_DIR, [MATCHES_CSV, DELIVERIES_CSV]):
+        write_frames(build_frames())
+    with store_lock(STORE_DIR):
+        touched = read_store(STORE_DIR, STORE_FRAMES, list(matches['season'].astype(str).unique()), wait=False)
+        batch = ingest_batch(touched, matches, deliveries)
+        append_csv(MATCHES_CSV, matches)
+        append_csv(DELIVERIES_CSV, deliveries)
+        # The manifest is written after the CSVs, so the store stays fresh
+        update_store_files(STORE_DIR, append_frames(touched, batch))
+    return batch
+
+def store_revision():
+    # Identity and update count of the store on disk, None before it is first written
+    try:
+        manifest = read_manifest(STORE_DIR)
+    except (OSError, ValueError):
+        return None
+    return {'built': manifest.get('built'), 'revision': manifest.get('revision', 0)}
+
+def read_appended(frames, revision):
+    # The matches (with their deliveries) appended to the store after revision that are not
+    # in frames yet, read from the partitions written since then only
+    seasons = changed_partitions(read_manifest(STORE_DIR), 'matches', revision)
+    changed = read_store(STORE_DIR, STORE_FRAMES, seasons)
+    matches = changed['matches'][~changed['matches']['id'].isin(frames['matches']['id'])]
+    deliveries = changed['deliveries'][changed['deliveries']['match_id'].isin(matches['id'])]
+    return {
+        'matches': matches.reset_index(drop=True),
+        'deliveries': deliveries.reset_index(drop=True),
+        'franchises': changed['franchises']
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Append a batch of new matches to the data and its columnar store")
+    parser.add_argument('matches', help="CSV of the new matches, same columns as matches.csv")
+    parser.add_argument('deliveries', help="CSV of their deliveries, same columns as deliveries.csv")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        batch = append_batch(
+            pd.read_csv(args.matches, dtype=csv_dtypes(args.matches)),
+            pd.read_csv(args.deliveries, dtype=csv_dtypes(args.deliveries))
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"Appended {len(batch['matches'])} matches and {len(batch['deliveries'])} deliveries")
@@ -0,0 +1,57 @@
+import pandas as pd
+from data_store import share_categories
+
+INNINGS_CONTEXT = ['season', 'venue', 'batting_team', 'bowling_team']
+
+def build_batting_innings(deliveries):
+    # One row per (batter, match) with the batter's runs, legal balls faced, boundaries and dismissal
+    flags = deliveries[['batter', 'match_id'] + INNINGS_CONTEXT + ['batsman_runs', 'is_wicket']].assign(
+        legal_ball=deliveries['extras_type'].ne('wides').astype('int32'),
+        four=(deliveries['batsman_runs'] == 4).astype('int32'),
+        six=(deliveries['batsman_runs'] == 6).astype('int32'),
+        batsman_runs=deliveries['batsman_runs'].astype('int32')
+    )
+    innings = flags.groupby(['batter', 'match_id'], observed=True, sort=True).agg(
+        **{col: (col, 'first') for col in INNINGS_CONTEXT},
+        runs=('batsman_runs', 'sum'),
+        balls=('legal_ball', 'sum'),
+        fours=('four', 'sum'),
+        sixes=('six', 'sum'),
+        dismissed=('is_wicket', 'sum')
+    )
+    return innings.astype({col: 'int64' for col in ['runs', 'balls', 'fours', 'sixes', 'dismissed']})
+
+def build_bowling_innings(deliveries):
+    # One row per (bowler, match) with the bowler's wickets, runs conceded, deliveries and boundaries
+    flags = deliveries[['bowler', 'match_id'] + INNINGS_CONTEXT + ['isBowlerWicket']].assign(
+        bowler_run=deliveries['bowler_run'].astype('int32'),
+        four=(deliveries['batsman_runs'] == 4).astype('int32'),
+        six=(deliveries['batsman_runs'] == 6).astype('int32')
+    )
+    innings = flags.groupby(['bowler', 'match_id'], observed=True, sort=True).agg(
+        **{col: (col, 'first') for col in INNINGS_CONTEXT},
+        wickets=('isBowlerWicket', 'sum'),
+        runs_conceded=('bowler_run', 'sum'),
+        balls=('bowler_run', 'size'),
+        fours=('four', 'sum'),
+        sixes=('six', 'sum')
+    )
+    return innings.astype({col: 'int64' for col in ['wickets', 'runs_conceded', 'balls', 'fours', 'sixes']})
+
+def build_innings_tables(deliveries):
+    return {
+        'batting': build_batting_innings(deliveries),
+        'bowling': build_bowling_innings(deliveries)
+    }
+
+def append_innings_tables(tables, deliveries):
+    # The tables after adding a batch of new matches; innings are per match so the batch only adds rows
+    batch = build_innings_tables(deliveries)
+    return {name: pd.concat([share_categories(table, batch[name]), batch[name]]).sort_index() for name, table in tables.items()}
+
+def player_innings(table, player):
+    # A player's innings (match_id index), empty if they never batted or bowled
+    try:
+        return table.loc[player]
+    except KeyError:
+        return table.iloc[0:0].droplevel(0)
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+PROFILE_LOG = './data/profile.jsonl'
+# The log is moved to profile.jsonl.1 (replacing the previous one) once it grows past this size
+PROFILE_LOG_MAX_BYTES = 10 * 2 ** 20
+
+# Phases of the script run executing on this thread (Streamlit gives every run its own thread)
+current_run = threading.local()
+
+# tracemalloc is process-wide while runs are per session: it is started by the first open run
+# that asks for memory tracing and stopped when the last such run closes, never in the middle
+# of another session's traced run
+tracing = {'runs': 0}
+tracing_lock = threading.Lock()
+log_lock = threading.Lock()
+
+def start_run(page, trace_memory=False):
+    # Begin collecting phases for one page render; memory is only traced when asked for
+    # since tracemalloc slows every allocation down
+    if run_in_progress():
+        end_run()
+    current_run.id = uuid.uuid4().hex[:12]
+    current_run.page = page
+    current_run.records = []
+    current_run.stack = []
+    current_run.open = True
+    current_run.traced = trace_memory
+    if trace_memory:
+        with tracing_lock:
+            tracing['runs'] += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+def end_run():
+    # Close the run, releasing its hold on memory tracing
+    current_run.open = False
+    if getattr(current_run, 'traced', False):
+        current_run.traced = False
+        with tracing_lock:
+            tracing['runs'] -= 1
+            if tracing['runs'] == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+def run_in_progress():
+    # True between start_run and write_run_log
+    return getattr(current_run, 'open', False)
+
+def run_records():
+    return list(getattr(current_run, 'records', []))
+
+@contextmanager
+def phase(name, rows=None):
+    # Time a block and, when this run traces memory, the peak of traced memory while it ran above
+    # its starting point. The peak is process-wide (process_peak_mb): it includes allocations of
+    # other threads, and while other traced runs are open the peak is not reset, so a phase reports
+    # at least the highest peak since any of them last reset it. The yielded record takes a rows
+    # count set after the fact, e.g. record['rows'] = len(df).
+    record = {'phase': name, 'rows': rows}
+    in_run = run_in_progress()
+    stack = current_run.stack if in_run else None
+    tracing_memory = in_run and current_run.traced and tracemalloc.is_tracing()
+    if tracing_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak is global, so fold the peak seen so far into the enclosing phase first, and
+        # leave it alone while other traced runs depend on it
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        with tracing_lock:
+            if tracing['runs'] == 1:
+                tracemalloc.reset_peak()
+        frame = {'start': current, 'peak': current}
+        stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = round(time.perf_counter() - start, 4)
+        if tracing_memory and tracemalloc.is_tracing():
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            record['process_peak_mb'] = round((peak - frame['start']) / 2 ** 20, 2)
+            stack.pop()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        # Phases outside a run (e.g. a panel refreshing on its own timer) are not recorded
+        if in_run:
+            current_run.records.append(record)
+
+def write_run_log(path=PROFILE_LOG):
+    # Append this run's phases as JSON lines for offline aggregation and close the run; its
+    # records stay readable until the next start_run
+    end_run()
+    records = run_records()
+    if not records:
+        return
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    try:
+        with log_lock:
+            if os.path.exists(path) and os.path.getsize(path) > PROFILE_LOG_MAX_BYTES:
+                os.replace(path, path + '.1')
+            with open(path, 'a') as f:
+                for record in records:
+                    f.write(json.dumps({'ts': timestamp, 'run': current_run.id, 'page': current_run.page, **record}) + '\n')
+    except OSError:
+        pass  # Profiling must never break a page
@@ -0,0 +1,616 @@
+import threading
+import numpy as np
+import pandas as pd
+from ingest import STORE_PARTITIONS, read_frames, append_batch, append_frames, appends_at_end, store_revision, read_appended
+from data_store import share_categories
+from player_index import build_player_indexes, append_player_indexes, player_deliveries
+from season_index import build_season_indexes, season_rows
+from cube import build_cube, append_cube, rollup
+from matchup_index import build_matchup_index, append_matchup_index, matchup
+from leaderboard import build_leaderboards, update_leaderboards, top_k
+from team_form import build_team_form_log, append_team_form_log, team_form_as_of, calculate_player_form
+from model_artifacts import load_prediction_artifacts, append_prediction_artifacts, save_prediction_artifacts
+from franchises import team_codes, same_franchise
+from standings import build_standings, append_standings, standings
+from innings import build_innings_tables, append_innings_tables, player_innings
+from scorecard import build_scorecards
+from win_model import build_win_model, predict_probabilities
+from win_replay import replay_win_probability
+from live_feed import live_feed, poll_feed, scoreboard, match_curve
+from utils import get_batsman_statistics, get_bowler_statistics
+from instrumentation import phase
+from result_cache import cached_query, new_dataset_generation
+
+# Headless query layer behind every feature page. Queries take the datasets they read plus plain
+# inputs and return DataFrames or dicts of them; the Streamlit pages only render the results.
+
+# Datasets for the pages and every other caller, built on first use and kept for the life of the
+# process, and brought up to date in place when matches are appended (see DATASET_UPDATERS).
+DATASET_BUILDERS = {
+    'frames': lambda: load_frames(),
+    'matches': lambda: dataset('frames')['matches'],
+    'deliveries': lambda: dataset('frames')['deliveries'],
+    'teams': lambda: sorted(dataset('matches')['team1'].unique()),
+    'players': lambda: sorted(dataset('deliveries')['batter'].unique()),
+    'seasons': lambda: sorted(dataset('matches')['season'].unique()),
+    'venues': lambda: sorted(dataset('matches')['venue'].dropna().unique()),
+    'franchises': lambda: dataset('frames')['franchises'],
+    'player_index': lambda: build_player_indexes(dataset('deliveries')),
+    'season_index': lambda: build_season_indexes(dataset('frames')),
+    'cube': lambda: build_cube(dataset('deliveries')),
+    'leaderboards': lambda: build_leaderboards(dataset('cube'), dataset('seasons')),
+    'matchup_index': lambda: build_matchup_index(dataset('cube')),
+    'team_form_log': lambda: build_team_form_log(dataset('matches'), dataset('deliveries')),
+    'innings': lambda: build_innings_tables(dataset('deliveries')),
+    'standings': lambda: build_standings(dataset('matches')),
+    'prediction_artifacts': lambda: load_prediction_artifacts(dataset('matches'), dataset('deliveries'), dataset('team_form_log')),
+    'win_model': lambda: prediction_model(dataset('prediction_artifacts'), dataset('matches'))
+}
+datasets = {}
+datasets_lock = threading.RLock()
+# Store revision the loaded frames reflect, see refresh_datasets
+loaded_revision = {}
+
+def dataset(name):
+    with datasets_lock:
+        if name not in datasets:
+            datasets[name] = DATASET_BUILDERS[name]()
+        return datasets[name]
+
+def load_frames():
+    # Note the store revision before reading it: an append landing mid-read is then picked up
+    # again by the next refresh, which skips matches already loaded
+    before = store_revision()
+    frames = read_frames()
+    after = store_revision()
+    loaded_revision.clear()
+    if after is not None:
+        loaded_revision.update(before if before is not None and before['built'] == after['built'] else after)
+    return frames
+
+def merged_list(values, new_values):
+    return sorted(set(values) | set(new_values))
+
+def append_prediction_model(old, new, batch):
+    # Player form is recomputed only for teams in the batch; the result is saved where a cold
+    # start with the same data looks for it
+    frames = new['frames']
+    artifacts = append_prediction_artifacts(old['prediction_artifacts'], frames['matches'], frames['deliveries'], new['team_form_log'], batch['matches'])
+    save_prediction_artifacts(frames['matches'], frames['deliveries'], artifacts)
+    return artifacts
+
+# How each dataset follows an appended batch of enriched matches and deliveries: from the
+# dataset before the append (old), the datasets already brought up to date (new, starting with
+# the appended frames) and the batch. Every step works from the batch and the existing
+# aggregates rather than the full history; row-position indexes are extended in place when the
+# batch lands after every loaded row.
+DATASET_UPDATERS = {
+    'matches': lambda old, new, batch: new['frames']['matches'],
+    'deliveries': lambda old, new, batch: new['frames']['deliveries'],
+    'teams': lambda old, new, batch: merged_list(old['teams'], batch['matches']['team1'].unique()),
+    'players': lambda old, new, batch: merged_list(old['players'], batch['deliveries']['batter'].unique()),
+    'seasons': lambda old, new, batch: merged_list(old['seasons'], batch['matches']['season'].unique()),
+    'venues': lambda old, new, batch: merged_list(old['venues'], batch['matches']['venue'].dropna().unique()),
+    'franchises': lambda old, new, batch: new['frames']['franchises'],
+    'player_index': lambda old, new, batch: (
+        append_player_indexes(old['player_index'], new['frames']['deliveries'], len(old['frames']['deliveries']))
+        if appends_at_end(old['frames'], batch) else build_player_indexes(new['frames']['deliveries'])
+    ),
+    'season_index': lambda old, new, batch: build_season_indexes(new['frames']),
+    'cube': lambda old, new, batch: append_cube(old['cube'], batch['deliveries']),
+    'leaderboards': lambda old, new, batch: update_leaderboards(old['leaderboards'], new['cube'], batch['matches']['season'].unique()),
+    'matchup_index': lambda old, new, batch: append_matchup_index(old['matchup_index'], build_cube(batch['deliveries'])),
+    'team_form_log': lambda old, new, batch: append_team_form_log(old['team_form_log'], batch['matches'], batch['deliveries']),
+    'innings': lambda old, new, batch: append_innings_tables(old['innings'], batch['deliveries']),
+    'standings': lambda old, new, batch: append_standings(old['standings'], batch['matches']),
+    'prediction_artifacts': append_prediction_model,
+    'win_model': lambda old, new, batch: prediction_model(new['prediction_artifacts'], new['frames']['matches'])
+}
+
+def append_datasets(batch):
+    # Bring every dataset built so far up to date with an enriched batch. The new datasets are
+    # built next to the old ones and swapped in together, so queries never see a partial update;
+    # datasets not built yet are left to build on first use as before.
+    with datasets_lock:
+        old = dict(datasets)
+        new = {'frames': append_frames(old['frames'], batch)}
+        # Batch categoricals recoded to the appended frames' categories, so aggregates built from
+        # the batch line up with the existing ones
+        batch = {**batch, **{name: share_categories(batch[name], new['frames'][name]) for name in STORE_PARTITIONS}}
+        for name, update in DATASET_UPDATERS.items():
+            if name in old:
+                new[name] = update(old, new, batch)
+        datasets.clear()
+        datasets.update(new)
+        new_dataset_generation()
+
+def refresh_datasets():
+    # Pick up matches appended to the store since the datasets were loaded, e.g. by the nightly
+    # `python ingest.py` run, without a restart. Returns whether anything changed.
+    with datasets_lock:
+        if 'frames' not in datasets:
+            return False
+        current = store_revision()
+        if current is None or current == loaded_revision:
+            return False
+        if current['built'] != loaded_revision.get('built'):
+            # The store was rebuilt from the CSVs: start over
+            datasets.clear()
+            new_dataset_generation()
+            return True
+        batch = read_appended(datasets['frames'], loaded_revision['revision'])
+        if len(batch['matches']):
+            append_datasets(batch)
+        loaded_revision.update(current)
+        return len(batch['matches']) > 0
+
+def ingest_matches(matches, deliveries):
+    # Add a batch of new matches and their deliveries (matches.csv/deliveries.csv columns): written
+    # to the CSVs and the store's season partitions, then applied to the loaded datasets
+    batch = append_batch(matches, deliveries)
+    current = store_revision()
+    with datasets_lock:
+        if 'frames' in datasets and current['built'] == loaded_revision.get('built') and current['revision'] == loaded_revision['revision'] + 1:
+            # Nothing else was appended in between: apply the batch as is
+            append_datasets(batch)
+            loaded_revision.update(current)
+        else:
+            refresh_datasets()
+    return batch
+
+def prediction_model(prediction_artifacts, matches):
+    # Win model from the persisted prediction artifacts
+    return build_win_model(prediction_artifacts['team_wins'], prediction_artifacts['team_forms'], prediction_artifacts['player_forms'], matches)
+
+@cached_query()
+def season_rivalry(matches, deliveries, season_index, team1, team2, season):
+    # Summary and scorecards of every meeting of the two teams in one season, None if they never met.
+    # Only the season's partition of matches and deliveries is read.
+    df_filtered = season_rows(matches, season_index['matches'], season)
+    df_filtered = df_filtered[(df_filtered['team1'].isin([team1, team2])) & (df_filtered['team2'].isin([team1, team2]))]
+    if df_filtered.empty:
+        return None
+
+    total_matches = df_filtered.shape[0]
+    team1_wins = df_filtered[df_filtered['winner'] == team1].shape[0]
+    team2_wins = df_filtered[df_filtered['winner'] == team2].shape[0]
+    ties = df_filtered[df_filtered['result'] == 'tie'].shape[0]
+    no_results = df_filtered[df_filtered['winner'].isna()].shape[0]
+
+    summary_data = {
+        'Metric': ['Total Matches', f'{team1} Wins', f'{team2} Wins', 'Ties', 'No Results'],
+        'Value': [total_matches, team1_wins, team2_wins, ties, no_results]
+    }
+    summary_df = pd.DataFrame(summary_data).set_index('Metric')
+
+    # Scorecards for each match in the season, built for all of them in one pass
+    with phase('scorecards', rows=len(df_filtered)):
+        scorecards = build_scorecards(season_rows(deliveries, season_index['deliveries'], season), df_filtered['id'])
+    return {'matches': df_filtered, 'summary': summary_df, 'scorecards': scorecards}
+
+@cached_query()
+def wins_by_season(matches, franchises, team1, team2):
+    # Wins of each team's franchise per season across their meetings, under any of its names
+    code1, code2 = team_codes(franchises, [team1, team2])
+    df_filtered = matches[(matches['team1_code'].isin([code1, code2])) & (matches['team2_code'].isin([code1, code2]))]
+    df_team1 = df_filtered[df_filtered['winner_code'] == code1].groupby('season', as_index=False, observed=True).size()
+    df_team2 = df_filtered[df_filtered['winner_code'] == code2].groupby('season', as_index=False, observed=True).size()
+    df_team1.rename(columns={'size': f'{team1}_wins'}, inplace=True)
+    df_team2.rename(columns={'size': f'{team2}_wins'}, inplace=True)
+    return pd.merge(df_team1, df_team2, on='season', how='outer').set_index('season').fillna(0)
+
+@cached_query()
+def season_wickets(cube, bowler1, bowler2):
+    # Wickets per season outside super overs for both bowlers, None if either never bowled
+    df_bowler1 = rollup(cube, ['season'], ['dismissals'], bowler=bowler1, inning=[1, 2]).reset_index()
+    df_bowler2 = rollup(cube, ['season'], ['dismissals'], bowler=bowler2, inning=[1, 2]).reset_index()
+    if df_bowler1.empty or df_bowler2.empty:
+        return None
+    df_bowler1.rename(columns={'dismissals': f'{bowler1}_wickets'}, inplace=True)
+    df_bowler2.rename(columns={'dismissals': f'{bowler2}_wickets'}, inplace=True)
+    return pd.merge(df_bowler1, df_bowler2, on='season', how='outer').set_index('season').fillna(0)
+
+@cached_query()
+def season_summary(deliveries, matches, player_index, season_index, innings, cube, season_year, team_name="None", player_name="None"):
+    # Team performance plus the top batter's and bowler's figures for one season/team/player filter,
+    # None when the filter matches no deliveries
+    def season_filter(df, bowling=False, in_season=False):
+        # in_season: df is already the season's partition
+        if not in_season:
+            df = df[df['season'] == season_year]
+        if team_name != "None":
+            if bowling:
+                df = df[df['bowling_team'] == team_name]
+            else:
+                df = df[(df['batting_team'] == team_name) | (df['bowling_team'] == team_name)]
+        return df
+
+    def top_player(column, measure, bowling=False):
+        # Leading player for the same filters, rolled up from the aggregate cube
+        filters = {'season': season_year}
+        if player_name != "None":
+            filters[column] = player_name
+        if team_name == "None":
+            totals = rollup(cube, [column], [measure], **filters)
+        elif bowling:
+            totals = rollup(cube, [column], [measure], bowling_team=team_name, **filters)
+        else:
+            totals = pd.concat([
+                rollup(cube, [column], [measure], batting_team=team_name, **filters),
+                rollup(cube, [column], [measure], bowling_team=team_name, **filters)
+            ]).groupby(level=column, observed=True).sum()
+        return totals[measure].sort_values(ascending=False).index[0] if not totals.empty else None
+
+    with phase('filter') as record:
+        # Player filters start from the player's own deliveries instead of scanning the whole table
+        if player_name != "None":
+            season_df = season_filter(player_deliveries(player_name, deliveries, player_index['batter'], 'batter'))
+            season_bowling_df = season_filter(player_deliveries(player_name, deliveries, player_index['bowler'], 'bowler'), bowling=True)
+        else:
+            season_deliveries = season_rows(deliveries, season_index['deliveries'], season_year)
+            season_df = season_filter(season_deliveries, in_season=True)
+            season_bowling_df = season_filter(season_deliveries, bowling=True, in_season=True)
+        record['rows'] = len(season_df) + len(season_bowling_df)
+
+    if season_df.empty and season_bowling_df.empty:
+        return None
+
+    with phase('aggregate'):
+        team_performance = pd.DataFrame()
+        if player_name == "None":
+            team_performance = season_df.groupby('batting_team', observed=True).agg(
+                matches=('match_id', 'nunique'),
+                total_runs=('total_runs', 'sum'),
+                total_wickets=('is_wicket', 'sum')
+            ).reset_index()
+
+        top_batsman_name = top_player('batter', 'runs')
+        top_bowler_name = top_player('bowler', 'bowler_wickets', bowling=True)
+
+        # Career figures come from the per-innings tables, filtered the same way as the deliveries
+        top_batsman_innings = season_filter(player_innings(innings['batting'], top_batsman_name)) if top_batsman_name else None
+        top_bowler_innings = season_filter(player_innings(innings['bowling'], top_bowler_name), bowling=True) if top_bowler_name else None
+        top_batsman_stats = get_batsman_statistics(top_batsman_name, top_batsman_innings, matches) if top_batsman_name else {}
+        top_bowler_stats = get_bowler_statistics(top_bowler_name, top_bowler_innings, matches) if top_bowler_name else {}
+    return {'team_performance': team_performance, 'top_batsman': top_batsman_stats, 'top_bowler': top_bowler_stats}
+
+@cached_query()
+def head_to_head(matches, franchises, team1, team2):
+    # Head-to-head record and the blended win probability for one pairing, None if they never met.
+    # Teams are matched by franchise code, so a franchise's record spans all of its names.
+    code1, code2 = team_codes(franchises, [team1, team2])
+    head_to_head_matches = matches[((matches['team1_code'] == code1) & (matches['team2_code'] == code2)) | ((matches['team1_code'] == code2) & (matches['team2_code'] == code1))]
+    total_matches = head_to_head_matches.shape[0]
+
+    if total_matches == 0:
+        return None
+
+    team1_wins = head_to_head_matches[head_to_head_matches['winner_code'] == code1].shape[0]
+    team2_wins = head_to_head_matches[head_to_head_matches['winner_code'] == code2].shape[0]
+    no_results = head_to_head_matches[head_to_head_matches['winner'].isna()].shape[0]
+    tied_matches = head_to_head_matches[head_to_head_matches['result'] == 'tie'].shape[0]
+
+    team1_win_pct = (team1_wins / total_matches) * 100 if total_matches > 0 else 0
+    team2_win_pct = (team2_wins / total_matches) * 100 if total_matches > 0 else 0
+    tied_pct = (tied_matches / total_matches) * 100 if total_matches > 0 else 0
+    no_result_pct = (no_results / total_matches) * 100 if total_matches > 0 else 0
+
+    team1_scores = []
+    team2_scores = []
+    for _, match in head_to_head_matches.iterrows():
+        if match['team1_code'] == code1:
+            if pd.notna(match['target_runs']):
+                team1_scores.append(match['target_runs'] - 1)
+        else:
+            if pd.notna(match['target_runs']):
+                team2_scores.append(match['target_runs'] - 1)
+        if match['team2_code'] == code1:
+            if pd.notna(match['result_margin']) and match['result'] == 'runs':
+                team1_scores.append(match['result_margin'])
+        else:
+            if pd.notna(match['result_margin']) and match['result'] == 'runs':
+                team2_scores.append(match['result_margin'])
+
+    team1_highest_score = max(team1_scores) if team1_scores else 0
+    team2_highest_score = max(team2_scores) if team2_scores else 0
+
+    head_to_head_data = {
+        '': ['Matches Played', f'{team1} Result on', f'{team2} Result on', 'Tied', 'No Result', 'Highest Score'],
+        team1: [
+            total_matches,
+            f'{team1_win_pct:.0f}% Won',
+            f'{team2_win_pct:.0f}% Lost',
+            f'{tied_pct:.0f}%',
+            f'{no_result_pct:.0f}%',
+            team1_highest_score
+        ],
+        team2: [
+            total_matches,
+            f'{team2_win_pct:.0f}% Won',
+            f'{team1_win_pct:.0f}% Lost',
+            f'{tied_pct:.0f}%',
+            f'{no_result_pct:.0f}%',
+            team2_highest_score
+        ]
+    }
+    head_to_head_df = pd.DataFrame(head_to_head_data)
+    head_to_head_df.set_index('', inplace=True)
+
+    recent_matches_team1 = matches[(matches['team1_code'] == code1) | (matches['team2_code'] == code1)].tail(5)
+    recent_wins_team1 = recent_matches_team1[recent_matches_team1['winner_code'] == code1].shape[0]
+    recent_form_win_rate_team1 = (recent_wins_team1 / 5) * 100 if not recent_matches_team1.empty else 50
+
+    head_to_head_win_rate = (team1_wins / total_matches) * 100 if total_matches > 0 else 50
+    final_win_probability = (0.7 * head_to_head_win_rate) + (0.3 * recent_form_win_rate_team1)
+
+    result = pd.DataFrame([{team1: round(final_win_probability, 2), team2: round(100 - final_win_probability, 2)}])
+    return {'head_to_head': head_to_head_df, 'win_probability': result}
+
+@cached_query()
+def top_strike_rates(leaderboards, season=None, min_balls=100, k=10):
+    # Qualifying batters come from the precomputed leaderboard, sorted by balls faced
+    board = leaderboards[('strike_rate', season)]
+    return top_k(board, min_balls, k).rename(columns={'runs': 'total_runs', 'balls': 'balls_faced'})
+
+@cached_query()
+def highest_targets(matches, k=10):
+    # Highest first-innings totals with the batting and chasing sides
+    def toss_winner(row):
+        if row['toss_winner'] == row['team1']:
+            return row['team1'] if row['toss_decision'] == 'bat' else row['team2']
+        else:
+            return row['team2'] if row['toss_decision'] == 'bat' else row['team1']
+
+    df_copy = matches.copy()
+    df_copy['batting_team'] = df_copy[['toss_decision', 'toss_winner', 'team1', 'team2']].apply(toss_winner, axis=1)
+    df_copy['team_against'] = df_copy.apply(lambda row: row['team2'] if row['batting_team'] == row['team1'] else row['team1'], axis=1)
+    df_copy = df_copy.sort_values(by="target_runs", ascending=False).reset_index().drop_duplicates()
+    df_copy['target_runs'] = df_copy['target_runs'] - 1
+    return df_copy[['batting_team', 'team_against', 'target_runs', 'date', 'venue', 'city', 'winner', 'result_margin']].head(k)
+
+def batting_by_season(batting):
+    # Season rows from a player's batting innings
+    batting_stats = batting.assign(
+        fifty=batting['runs'] >= 50,
+        century=batting['runs'] >= 100
+    ).groupby('season', observed=True).agg(
+        matches=('runs', 'size'),
+        runs=('runs', 'sum'),
+        balls=('balls', 'sum'),
+        dismissals=('dismissed', 'sum'),
+        fifties=('fifty', 'sum'),
+        centuries=('century', 'sum'),
+        highest_score=('runs', 'max')
+    ).reset_index()
+    batting_stats['strike_rate'] = (batting_stats['runs'] / batting_stats['balls'] * 100).round(2)
+    batting_stats['average'] = (batting_stats['runs'] / batting_stats['dismissals']).round(2).replace([np.inf, -np.inf], 'N/A')
+    return batting_stats
+
+def bowling_by_season(bowling):
+    # Season rows from a player's bowling innings
+    bowling_stats = bowling.assign(
+        three=bowling['wickets'] >= 3,
+        four=bowling['wickets'] >= 4,
+        five=bowling['wickets'] >= 5
+    ).groupby('season', observed=True).agg(
+        matches=('wickets', 'size'),
+        wickets=('wickets', 'sum'),
+        runs_conceded=('runs_conceded', 'sum'),
+        balls=('balls', 'sum'),
+        three_wickets=('three', 'sum'),
+        four_wickets=('four', 'sum'),
+        five_wickets=('five', 'sum')
+    ).reset_index()
+    bowling_stats['overs'] = (bowling_stats['balls'] / 6).round(2)
+    bowling_stats['economy'] = (bowling_stats['runs_conceded'] / bowling_stats['overs']).round(2).replace([np.inf, -np.inf], 'N/A')
+    bowling_stats['bowling_average'] = (bowling_stats['runs_conceded'] / bowling_stats['wickets']).round(2).replace([np.inf, -np.inf], 'N/A')
+    return bowling_stats
+
+@cached_query()
+def player_vs_team(innings, player, opponent_team):
+    # Season batting and bowling tables for one player against one team
+    batting = player_innings(innings['batting'], player)
+    bowling = player_innings(innings['bowling'], player)
+    return {
+        'batting': batting_by_season(batting[batting['bowling_team'] == opponent_team]),
+        'bowling': bowling_by_season(bowling[bowling['batting_team'] == opponent_team])
+    }
+
+@cached_query()
+def player_comparison(innings, player1, player2, opponent_team):
+    # Career-against-the-team summary of two players side by side
+    def summary(stats):
+        batting_stats, bowling_stats = stats['batting'], stats['bowling']
+        batting_avg = pd.to_numeric(batting_stats['average'], errors='coerce')
+        bowling_avg = pd.to_numeric(bowling_stats['bowling_average'], errors='coerce')
+        economy = pd.to_numeric(bowling_stats['economy'], errors='coerce')
+        return [
+            batting_stats['runs'].sum(),
+            round(batting_avg.mean(), 2) if not batting_avg.isna().all() else 'N/A',
+            round(batting_stats['strike_rate'].mean(), 2) if not batting_stats['strike_rate'].isna().all() else 'N/A',
+            bowling_stats['wickets'].sum(),
+            round(bowling_avg.mean(), 2) if not bowling_avg.isna().all() else 'N/A',
+            round(economy.mean(), 2) if not economy.isna().all() else 'N/A'
+        ]
+
+    comparison_data = {
+        'Metric': ['Total Runs', 'Batting Average', 'Strike Rate', 'Total Wickets', 'Bowling Average', 'Economy'],
+        player1: summary(player_vs_team(innings, player1, opponent_team)),
+        player2: summary(player_vs_team(innings, player2, opponent_team))
+    }
+    comparison_df = pd.DataFrame(comparison_data)
+    comparison_df.set_index('Metric', inplace=True)
+    return comparison_df
+
+@cached_query()
+def team_performance(standings_table, franchises, season=None):
+    # Standings of every franchise overall or, for one season, of the franchises that played in it,
+    # with renamed sides counted under their current name
+    teams = sorted(franchises['franchise'].unique())
+    team_stats = standings(standings_table, franchises, season=season, teams=teams)
+    team_stats = team_stats.rename(columns={
+        'played': 'Matches Played',
+        'won': 'Wins',
+        'lost': 'Losses',
+        'tied': 'Ties',
+        'no_result': 'No Results',
+        'win_pct': 'Win Percentage'
+    })
+    team_stats.index.name = 'Team'
+    if season is not None:
+        team_stats = team_stats[team_stats['Matches Played'] > 0]
+    return team_stats
+
+@cached_query()
+def matchup_tables(matchup_index, batsman, bowler, season="All"):
+    # Season, venue and all-season tables for one pair, None if they never met
+    # Look up the pair's per-season, per-venue totals in the matchup index
+    pair_stats = matchup(matchup_index, batsman, bowler)
+    if pair_stats.empty:
+        return None
+
+    # Filter by season if selected
+    relevant_stats = pair_stats
+    if season != "All":
+        relevant_stats = pair_stats[pair_stats.index.get_level_values('season') == season]
+
+    # Aggregate stats by season
+    season_stats = relevant_stats.groupby(level='season', observed=True)[['runs', 'dismissals']].sum().reset_index()
+    season_stats.columns = ['Season', 'Runs Scored', 'Times Dismissed']
+
+    # Aggregate stats by venue for the selected/filtered season
+    venue_stats = relevant_stats.groupby(level='venue', observed=True)[['runs', 'dismissals']].sum().reset_index()
+    venue_stats.columns = ['Venue', 'Runs Scored', 'Times Dismissed']
+
+    # Overall summary across all seasons
+    all_seasons_stats = pair_stats[['runs', 'dismissals']].sum().to_frame().T
+    all_seasons_stats.columns = ['Total Runs Scored', 'Total Times Dismissed']
+    all_seasons_venues = pair_stats.groupby(level='venue', observed=True)[['runs', 'dismissals']].sum().reset_index()
+    all_seasons_venues.columns = ['Venue', 'Total Runs Scored', 'Total Times Dismissed']
+    return {'season': season_stats, 'venue': venue_stats, 'all_seasons': all_seasons_stats, 'all_seasons_venues': all_seasons_venues}
+
+@cached_query()
+def batsman_matchups(matchup_index, batsman, bowlers):
+    # Per-bowler season tables for one batter and a performance score over all of them,
+    # score None when the batter never faced any of the bowlers
+    def season_table(pair_stats):
+        season_stats = pair_stats.groupby(level='season', observed=True)[['runs', 'dismissals', 'deliveries', 'sixes', 'fours']].sum().reset_index()
+        season_stats.columns = ['Season', 'Runs Scored', 'Times Dismissed', 'Balls Faced', 'Sixes Hit', 'Fours Hit']
+        return season_stats
+
+    tables = {}
+    pair_totals = []
+    for bowler in bowlers:
+        pair_stats = matchup(matchup_index, batsman, bowler)
+        if not pair_stats.empty:
+            tables[bowler] = season_table(pair_stats)
+            pair_totals.append(pair_stats.sum())
+    if not pair_totals:
+        return {'bowlers': tables, 'score': None}
+
+    totals = sum(pair_totals)
+    balls_faced = totals['deliveries']
+    if balls_faced > 0:
+        strike_rate = (totals['runs'] / balls_faced) * 100
+    else:
+        strike_rate = 0
+    score = (totals['runs'] * 1.5 + strike_rate + totals['sixes'] * 10 + totals['fours'] * 5) / (totals['dismissals'] + 1)
+    return {'bowlers': tables, 'score': score}
+
+@cached_query()
+def team_form(matches, deliveries, team_form_log, team, n_matches=5):
+    # Recent results and leading players of one team
+    win_rate, avg_runs, avg_wickets = team_form_as_of(team_form_log, [team], n_matches=n_matches)
+    batting_form, bowling_form, top_batsmen, top_bowlers = calculate_player_form(team, deliveries, matches)
+    return {
+        'win_rate': win_rate[0],
+        'avg_runs': avg_runs[0],
+        'avg_wickets': avg_wickets[0],
+        'batting_form': batting_form,
+        'bowling_form': bowling_form,
+        'top_batsmen': top_batsmen,
+        'top_bowlers': top_bowlers
+    }
+
+def win_probability(win_model, batting_team, bowling_team, host_city, score, overs_completed, wickets_out, target, weather="Clear"):
+    # Win probability of each side from one match state
+    batting_probs, bowling_probs = predict_probabilities(
+        win_model, [batting_team], [bowling_team], [host_city], [score], [overs_completed], [wickets_out], [target], [weather]
+    )
+    return {batting_team: batting_probs[0], bowling_team: bowling_probs[0]}
+
+@cached_query()
+def replay_matches(matches):
+    # Label of every match for picking one to replay, most recent first
+    return {
+        row.id: f"{row.date} | {row.team1} vs {row.team2} ({row.id})"
+        for row in matches.sort_values(by='date', ascending=False).itertuples()
+    }
+
+@cached_query()
+def match_replay(win_model, matches, deliveries, match_id):
+    # Ball-by-ball win probability of the chasing side for a completed match
+    with phase('replay') as record:
+        curve = replay_win_probability(win_model, matches, deliveries, [match_id])
+        record['rows'] = len(curve)
+    return curve
+
+def live_matches(win_model, team_form_log):
+    # Current state of every match in the live feed after applying the deliveries that arrived
+    # since the last call. Not cached: the feed changes from one ball to the next.
+    feed = live_feed()
+    with phase('live_feed') as record:
+        record['rows'] = poll_feed(feed, win_model, team_form_log)
+    return scoreboard(feed)
+
+def live_match(win_model, team_form_log, match_id):
+    # Chase win probability after every ball of one live match so far (None if not in the feed)
+    feed = live_feed()
+    poll_feed(feed, win_model, team_form_log)
+    return match_curve(feed, match_id)
+
+# Every query by name with the datasets it reads (in call order) and its other parameters with
+# their types, for callers that look queries up by name such as the JSON API
+QUERIES = {
+    'season_rivalry': {'query': season_rivalry, 'datasets': ['matches', 'deliveries', 'season_index'], 'params': {'team1': str, 'team2': str, 'season': str}},
+    'wins_by_season': {'query': wins_by_season, 'datasets': ['matches', 'franchises'], 'params': {'team1': str, 'team2': str}},
+    'season_wickets': {'query': season_wickets, 'datasets': ['cube'], 'params': {'bowler1': str, 'bowler2': str}},
+    'season_summary': {
+        'query': season_summary,
+        'datasets': ['deliveries', 'matches', 'player_index', 'season_index', 'innings', 'cube'],
+        'params': {'season_year': str, 'team_name': str, 'player_name': str}
+    },
+    'head_to_head': {'query': head_to_head, 'datasets': ['matches', 'franchises'], 'params': {'team1': str, 'team2': str}},
+    'top_strike_rates': {'query': top_strike_rates, 'datasets': ['leaderboards'], 'params': {'season': str, 'min_balls': int, 'k': int}},
+    'highest_targets': {'query': highest_targets, 'datasets': ['matches'], 'params': {'k': int}},
+    'player_vs_team': {'query': player_vs_team, 'datasets': ['innings'], 'params': {'player': str, 'opponent_team': str}},
+    'player_comparison': {'query': player_comparison, 'datasets': ['innings'], 'params': {'player1': str, 'player2': str, 'opponent_team': str}},
+    'team_performance': {'query': team_performance, 'datasets': ['standings', 'franchises'], 'params': {'season': str}},
+    'matchup_tables': {'query': matchup_tables, 'datasets': ['matchup_index'], 'params': {'batsman': str, 'bowler': str, 'season': str}},
+    'batsman_matchups': {'query': batsman_matchups, 'datasets': ['matchup_index'], 'params': {'batsman': str, 'bowlers': list}},
+    'team_form': {'query': team_form, 'datasets': ['matches', 'deliveries', 'team_form_log'], 'params': {'team': str, 'n_matches': int}},
+    'win_probability': {
+        'query': win_probability,
+        'datasets': ['win_model'],
+        'params': {
+            'batting_team': str, 'bowling_team': str, 'host_city': str, 'score': float,
+            'overs_completed': float, 'wickets_out': int, 'target': float, 'weather': str
+        }
+    },
+    'match_replay': {'query': match_replay, 'datasets': ['win_model', 'matches', 'deliveries'], 'params': {'match_id': int}},
+    'live_matches': {'query': live_matches, 'datasets': ['win_model', 'team_form_log'], 'params': {}},
+    'live_match': {'query': live_match, 'datasets': ['win_model', 'team_form_log'], 'params': {'match_id': int}}
+}
+
+def run_query(name, params):
+    # Run a query by name against the process datasets. params maps parameter names to lists of
+    # raw string values (as parsed from a query string); unknown names raise KeyError and
+    # missing or malformed values raise ValueError/TypeError.
+    spec = QUERIES[name]
+    kwargs = {}
+    for param, values in params.items():
+        if param not in spec['params']:
+            raise TypeError(f"unexpected parameter {param!r}")
+        kind = spec['params'][param]
+        kwargs[param] = list(values) if kind is list else kind(values[-1])
+    return spec['query'](*[dataset(dataset_name) for dataset_name in spec['datasets']], **kwargs)
@@ -0,0 +1,61 @@
+import numpy as np
+from cube import rollup
+
+# How each leaderboard is derived from the cube measures: value = numerator / denominator * scale,
+# players qualify on the qualifier measure, and ascending boards rank the lowest value first
+LEADERBOARD_STATS = {
+    'strike_rate': {'player': 'batter', 'numerator': 'runs', 'denominator': 'balls', 'scale': 100, 'qualifier': 'balls', 'ascending': False},
+    'batting_average': {'player': 'batter', 'numerator': 'runs', 'denominator': 'dismissals', 'scale': 1, 'qualifier': 'balls', 'ascending': False},
+    'economy': {'player': 'bowler', 'numerator': 'bowler_runs', 'denominator': 'deliveries', 'scale': 6, 'qualifier': 'deliveries', 'ascending': True},
+    'bowling_average': {'player': 'bowler', 'numerator': 'bowler_runs', 'denominator': 'bowler_wickets', 'scale': 1, 'qualifier': 'deliveries', 'ascending': True},
+    'bowling_strike_rate': {'player': 'bowler', 'numerator': 'deliveries', 'denominator': 'bowler_wickets', 'scale': 1, 'qualifier': 'deliveries', 'ascending': True}
+}
+
+def build_leaderboard(cube, stat, season=None):
+    # Per-player totals sorted by the qualifier so a minimum threshold is one binary search
+    spec = LEADERBOARD_STATS[stat]
+    measures = list(dict.fromkeys([spec['numerator'], spec['denominator'], spec['qualifier']]))
+    filters = {} if season is None else {'season': season}
+    table = rollup(cube, [spec['player']], measures, **filters)
+    numerator = table[spec['numerator']].to_numpy(dtype=float)
+    denominator = table[spec['denominator']].to_numpy(dtype=float)
+    # Players with a zero denominator (no dismissals, no wickets) have no value and never rank
+    table[stat] = np.divide(numerator, denominator, out=np.full(len(table), np.nan), where=denominator > 0) * spec['scale']
+    table = table[table[stat].notna()]
+    table = table.iloc[np.argsort(table[spec['qualifier']].to_numpy(), kind='stable')]
+    return {
+        'stat': stat,
+        'ascending': spec['ascending'],
+        'qualifier': table[spec['qualifier']].to_numpy(),
+        'values': table[stat].to_numpy(),
+        'table': table
+    }
+
+def build_leaderboards(cube, seasons):
+    # Every board for all seasons together (key None) and for each season
+    return {
+        (stat, season): build_leaderboard(cube, stat, season)
+        for stat in LEADERBOARD_STATS
+        for season in [None] + list(seasons)
+    }
+
+def update_leaderboards(boards, cube, seasons):
+    # Rebuild only the boards a batch of deliveries from the given seasons can change: those
+    # seasons' boards and the all-seasons ones
+    boards = dict(boards)
+    for stat in LEADERBOARD_STATS:
+        for season in [None] + list(seasons):
+            boards[(stat, season)] = build_leaderboard(cube, stat, season)
+    return boards
+
+def top_k(board, min_qualifier=0, k=10):
+    # Best k players with at least min_qualifier balls/deliveries: binary search for the
+    # qualifying suffix, then a partial sort of just that suffix
+    start = np.searchsorted(board['qualifier'], min_qualifier, side='left')
+    keys = board['values'][start:] if board['ascending'] else -board['values'][start:]
+    if k < len(keys):
+        candidates = np.argpartition(keys, k - 1)[:k]
+    else:
+        candidates = np.arange(len(keys))
+    best = candidates[np.lexsort((candidates, keys[candidates]))]
+    return board['table'].iloc[start + best]
@@ -0,0 +1,253 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from win_model import MODEL_WEIGHTS, team_factors, situation_probabilities
+from team_form import team_form_as_of
+
+logger = logging.getLogger(__name__)
+
+# Ball-by-ball events of matches in progress, one JSON object per line with the deliveries.csv
+# fields (match_id, inning, batting_team, bowling_team, over, ball, total_runs, extras_type,
+# is_wicket, ...). Optional city, weather and target fields give the host city, the weather and
+# a revised target; without a target the chase is set the first-innings total + 1.
+LIVE_FEED = './data/live/deliveries.jsonl'
+# Deliveries that do not count towards the over, as in the historical replay
+NON_LEGAL_EXTRAS = ['wides', 'noballs']
+# Fields every event must carry
+EVENT_FIELDS = ['match_id', 'inning', 'batting_team', 'bowling_team', 'over', 'ball', 'total_runs', 'is_wicket']
+# Seconds a finished chase stays on the scoreboard, and seconds without a delivery after which
+# any other match (abandoned, or a first innings whose chase never arrives) is dropped
+FINISHED_TTL = 60
+IDLE_TTL = 3600
+
+# Tail state of every feed file in the process, shared by all pages and API callers
+feeds = {}
+feeds_lock = threading.Lock()
+
+def live_feed(path=LIVE_FEED):
+    with feeds_lock:
+        if path not in feeds:
+            feeds[path] = {'path': path, 'offset': 0, 'matches': {}, 'finished': {}, 'lock': threading.Lock()}
+        return feeds[path]
+
+def read_lines(path, offset):
+    # Complete lines appended since offset, each with the offset just past it. A line still being
+    # written is left for the next read.
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return []
+    lines = []
+    for line in chunk[:chunk.rfind(b'\n') + 1].splitlines(keepends=True):
+        offset += len(line)
+        lines.append((line, offset))
+    return lines
+
+def parse_event(line):
+    # One event from a feed line, with its counters as ints; ValueError if it is not a JSON
+    # object with every required field
+    event = json.loads(line)
+    if not isinstance(event, dict):
+        raise ValueError("event is not a JSON object")
+    missing = [field for field in EVENT_FIELDS if event.get(field) is None]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    if not isinstance(event['match_id'], (int, str)) or not all(isinstance(event[team], str) for team in ['batting_team', 'bowling_team']):
+        raise ValueError("match_id must be a number or string and teams must be strings")
+    for field in ['inning', 'over', 'ball', 'total_runs', 'is_wicket']:
+        event[field] = int(event[field])
+    if event.get('target') is not None:
+        event['target'] = float(event['target'])
+    return event
+
+def new_match(event):
+    return {
+        'match_id': event['match_id'],
+        'inning': None,
+        'city': event.get('city'),
+        'weather': event.get('weather') or 'Clear',
+        'score': 0,
+        'target': None,
+        'curve': [],
+        'updated': time.monotonic()
+    }
+
+def start_innings(match, event, win_model, team_form_log, weights=MODEL_WEIGHTS):
+    # Reset the running totals and cache everything that stays fixed for the innings: the model's
+    # team and player form factors for the batting side, and both teams' recent form for display
+    if event['inning'] == 2:
+        target = event.get('target')
+        match['target'] = target if target is not None else (match['score'] + 1 if match['inning'] == 1 else None)
+    else:
+        match['target'] = None
+    batting_team, bowling_team = event['batting_team'], event['bowling_team']
+    match.update(
+        inning=event['inning'], batting_team=batting_team, bowling_team=bowling_team,
+        score=0, wickets=0, legal_balls=0, deliveries=0, over=0, ball=0
+    )
+    factors = team_factors(win_model, [batting_team], [bowling_team], [match['city']], [match['weather']], weights)
+    match['factors'] = {name: value[0] for name, value in factors.items()}
+    win_rate, avg_runs, avg_wickets = team_form_as_of(team_form_log, [batting_team, bowling_team])
+    player_form = win_model['teams'].reindex([batting_team, bowling_team])
+    match['form'] = pd.DataFrame({
+        'win_rate': win_rate,
+        'avg_runs': avg_runs,
+        'avg_wickets': avg_wickets,
+        'batting_form': player_form['batting_form'].fillna(0).to_numpy(),
+        'bowling_form': player_form['bowling_form'].fillna(0).to_numpy()
+    }, index=pd.Index([batting_team, bowling_team], name='team'))
+
+def apply_event(match, event):
+    # Running totals after one delivery
+    match['score'] += event['total_runs']
+    match['wickets'] += event['is_wicket']
+    match['legal_balls'] += event.get('extras_type') not in NON_LEGAL_EXTRAS
+    match['deliveries'] += 1
+    match['over'], match['ball'] = event['over'], event['ball']
+    match['updated'] = time.monotonic()
+
+def chase_over(match):
+    return match['target'] is not None and (
+        match['score'] >= match['target'] or match['wickets'] >= 10 or match['legal_balls'] >= 120
+    )
+
+def score_states(states, weights=MODEL_WEIGHTS):
+    # Chase win probabilities for (match, score, wickets, legal balls) states of any number of
+    # matches in one vectorized pass, from each match's cached innings factors
+    factors = {name: np.array([match['factors'][name] for match, *_ in states]) for name in ['base', 'external', 'rainy']}
+    scores = np.array([state[1] for state in states], dtype=float)
+    targets = np.array([match['target'] for match, *_ in states], dtype=float)
+    chasing_prob, defending_prob = situation_probabilities(
+        factors, scores, np.array([state[3] for state in states]) / 6, np.array([state[2] for state in states]), targets, weights
+    )
+    # Once the target is reached the chase is won, whatever the overs and wickets
+    reached = scores >= targets
+    return np.where(reached, 1.0, chasing_prob), np.where(reached, 0.0, defending_prob)
+
+def poll_feed(feed, win_model, team_form_log, weights=MODEL_WEIGHTS):
+    # Apply the events appended since the last poll. Each delivery updates its match in O(1);
+    # the chase states of all of them are then scored together. Lines that are not valid events
+    # are logged and skipped, and the offset only moves past lines that were applied or skipped,
+    # so an unexpected error leaves the rest of the batch for the next poll. Returns the number
+    # of events applied.
+    with feed['lock']:
+        if os.path.exists(feed['path']) and os.path.getsize(feed['path']) < feed['offset']:
+            # The feed was truncated or replaced: start over
+            feed['offset'], feed['matches'], feed['finished'] = 0, {}, {}
+        states = []
+        applied = 0
+        try:
+            for line, end in read_lines(feed['path'], feed['offset']):
+                if line.strip():
+                    try:
+                        event = parse_event(line)
+                    except (ValueError, TypeError) as error:
+                        logger.warning("skipping feed line at offset %d of %s: %s", feed['offset'], feed['path'], error)
+                        event = None
+                    if event is not None and event['match_id'] not in feed['finished']:
+                        match = feed['matches'].get(event['match_id'])
+                        if match is None:
+                            match = feed['matches'][event['match_id']] = new_match(event)
+                        if event['inning'] != match['inning']:
+                            start_innings(match, event, win_model, team_form_log, weights)
+                        apply_event(match, event)
+                        applied += 1
+                        if match['target'] is not None:
+                            states.append((match, match['score'], match['wickets'], match['legal_balls'], match['deliveries'], match['over'], match['ball']))
+                        if chase_over(match):
+                            feed['finished'][event['match_id']] = time.monotonic()
+                feed['offset'] = end
+        finally:
+            if states:
+                chasing_prob, defending_prob = score_states(states, weights)
+                for (match, score, wickets, _, delivery, over, ball), chasing, defending in zip(states, chasing_prob, defending_prob):
+                    match['curve'].append((delivery, over, ball, score, wickets, chasing, defending))
+            evict_matches(feed)
+        return applied
+
+def evict_matches(feed):
+    # Drop finished chases after FINISHED_TTL and every other match idle for IDLE_TTL. Finished
+    # ids are remembered for IDLE_TTL so stray late deliveries do not bring a match back.
+    now = time.monotonic()
+    for match_id, match in list(feed['matches'].items()):
+        finished_at = feed['finished'].get(match_id)
+        if (finished_at is not None and now - finished_at > FINISHED_TTL) or now - match['updated'] > IDLE_TTL:
+            del feed['matches'][match_id]
+    for match_id, finished_at in list(feed['finished'].items()):
+        if now - finished_at > IDLE_TTL:
+            del feed['finished'][match_id]
+
+def overs_label(legal_balls):
+    # Cricket notation: 16.3 is three balls into the 17th over
+    return f"{legal_balls // 6}.{legal_balls % 6}"
+
+def scoreboard(feed):
+    # One row per match in the feed with its current innings, rates and chase probabilities
+    rows = []
+    with feed['lock']:
+        for match in feed['matches'].values():
+            overs = match['legal_balls'] / 6
+            chase = match['target'] is not None
+            latest = match['curve'][-1] if chase and match['curve'] else None
+            rows.append({
+                'match_id': match['match_id'],
+                'inning': match['inning'],
+                'batting_team': match['batting_team'],
+                'bowling_team': match['bowling_team'],
+                'score': f"{match['score']}/{match['wickets']}",
+                'overs': overs_label(match['legal_balls']),
+                'run_rate': round(match['score'] / overs, 2) if overs > 0 else 0.0,
+                'target': match['target'],
+                'required_rate': round((match['target'] - match['score']) / (20 - overs), 2) if chase and overs < 20 else None,
+                'batting_win_prob': latest[5] if latest else None,
+                'bowling_win_prob': latest[6] if latest else None
+            })
+    return pd.DataFrame(rows, columns=[
+        'match_id', 'inning', 'batting_team', 'bowling_team', 'score', 'overs', 'run_rate', 'target',
+        'required_rate', 'batting_win_prob', 'bowling_win_prob'
+    ]).set_index('match_id')
+
+def match_curve(feed, match_id):
+    # Win probability after every delivery of a match's chase so far, plus the form cached at
+    # the start of the current innings (None for a match not in the feed)
+    with feed['lock']:
+        match = feed['matches'].get(match_id)
+        if match is None:
+            return None
+        curve = pd.DataFrame(match['curve'], columns=['delivery', 'over', 'ball', 'score', 'wickets', 'batting_win_prob', 'bowling_win_prob'])
+        return {'match': {key: match[key] for key in ['batting_team', 'bowling_team', 'inning', 'target']}, 'curve': curve, 'form': match['form']}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write the deliveries of past matches to a live feed, ball by ball")
+    parser.add_argument('match_ids', type=int, nargs='+', help="Matches to replay; several are interleaved as if played at once")
+    parser.add_argument('--feed', default=LIVE_FEED, help="JSON-lines file to append to")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between balls")
+    args = parser.parse_args()
+
+    from ingest import DELIVERIES_CSV, read_frames
+    frames = read_frames(['matches', 'deliveries'])
+    columns = list(pd.read_csv(DELIVERIES_CSV, nrows=0).columns)
+    match_info = frames['matches'].set_index('id')
+    replays = []
+    for match_id in args.match_ids:
+        balls = frames['deliveries'][frames['deliveries']['match_id'] == match_id][columns].astype(object)
+        balls = balls.where(balls.notna(), None).assign(city=match_info['city'].astype(object).get(match_id))
+        # The recorded (possibly revised) target goes with the chase, as in the historical replay
+        target = match_info['target_runs'].get(match_id)
+        balls['target'] = [target if inning == 2 and pd.notna(target) else None for inning in balls['inning']]
+        replays.append(balls.to_dict('records'))
+    os.makedirs(os.path.dirname(args.feed) or '.', exist_ok=True)
+    with open(args.feed, 'a') as f:
+        for step in range(max(map(len, replays))):
+            for balls in replays:
+                if step < len(balls):
+                    f.write(json.dumps(balls[step], default=int) + '\n')
+            f.flush()
+            time.sleep(args.interval)
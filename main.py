@@ -1,16 +1,25 @@
 import streamlit as st
-from data_loader import load_data
-from features.team_vs_team_growth import team_vs_team_growth
-from features.bowler_comparison import bowler_comparison
-from features.season_stats import season_stats
-from features.winning_probability import winning_probability
-from features.top_batsmen_strike_rate import top_batsmen_strike_rate
-from features.highest_targets_set import highest_targets_set
-from features.player_vs_team_stats import player_vs_team_stats
-from features.overall_team_performance import overall_team_performance
-from features.live_match_prediction import live_match_prediction
-from features.batsman_vs_bowler_stats import batsman_vs_bowler_stats
-from features.choose_the_best import choose_the_best
+from data_loader import load_datasets
+from pages import PAGES, page_renderer
+from instrumentation import start_run, run_in_progress, phase, run_records, write_run_log
+from result_cache import cache_stats
+
+@st.fragment
+def render_page(page, trace_memory):
+    # Widget interactions inside a feature page rerun only this fragment instead of the whole
+    # script. Those reruns are logged as runs of their own. The datasets are fetched by name on
+    # every run, fragment reruns included, so matches appended since the last full run are seen.
+    fragment_rerun = not run_in_progress()
+    if fragment_rerun:
+        start_run(page, trace_memory=trace_memory)
+    try:
+        datasets = load_datasets(PAGES[page]['datasets'])
+        with phase('render'):
+            page_renderer(page)(*datasets)
+    finally:
+        # Also on errors and st.rerun, so the run gives up memory tracing
+        if fragment_rerun:
+            write_run_log()
 
 # Initialize session state
 if "page" not in st.session_state:
@@ -157,10 +166,6 @@ if st.session_state.page == "home":
     st.markdown('</div>', unsafe_allow_html=True)
     st.stop()
 
-# Load data
-matches, deliveries, merged_df, bowler_data, teams, players, seasons = load_data()
-venues = sorted(matches['venue'].dropna().unique())
-
 # Dashboard page
 if st.session_state.page == "dashboard":
     st.markdown('<div style="text-align: center; margin-bottom: 20px;">', unsafe_allow_html=True)
@@ -174,64 +179,17 @@ if st.session_state.page == "dashboard":
         st.rerun()
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # Feature selection
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        if st.button("Team vs Team Growth"):
-            st.session_state.page = "team_vs_team_growth"
-            st.rerun()
-    with col2:
-        if st.button("Bowler Comparison"):
-            st.session_state.page = "bowler_comparison"
-            st.rerun()
-    with col3:
-        if st.button("Season Stats"):
-            st.session_state.page = "season_stats"
-            st.rerun()
-
-    col4, col5, col6 = st.columns(3)
-    with col4:
-        if st.button("Winning Probability"):
-            st.session_state.page = "winning_probability"
-            st.rerun()
-    with col5:
-        if st.button("Top Batsmen Strike Rate"):
-            st.session_state.page = "top_batsmen_strike_rate"
-            st.rerun()
-    with col6:
-        if st.button("Highest Targets Set"):
-            st.session_state.page = "highest_targets_set"
-            st.rerun()
-
-    col7, col8, col9 = st.columns(3)
-    with col7:
-        if st.button("Player vs Team Stats"):
-            st.session_state.page = "player_vs_team_stats"
-            st.rerun()
-    with col8:
-        if st.button("Overall Team Performance"):
-            st.session_state.page = "overall_team_performance"
-            st.rerun()
-    with col9:
-        if st.button("Live Match Prediction"):
-            st.session_state.page = "live_match_prediction"
-            st.rerun()
-
-    col10, col11, col12 = st.columns(3)
-    with col10:
-        if st.button("Batsman vs Bowler Stats"):
-            st.session_state.page = "batsman_vs_bowler_stats"
-            st.rerun()
-    with col11:
-        if st.button("Choose the Best", key="choose_the_best_button"):
-            st.session_state.page = "choose_the_best"
-            st.rerun()
+    # Feature selection, three buttons per row in registry order
+    page_names = list(PAGES)
+    for row_start in range(0, len(page_names), 3):
+        for col, page in zip(st.columns(3), page_names[row_start:row_start + 3]):
+            with col:
+                if st.button(PAGES[page]['label'], key=PAGES[page].get('button_key')):
+                    st.session_state.page = page
+                    st.rerun()
 
 # Feature pages
-if st.session_state.page in ["team_vs_team_growth", "bowler_comparison", "season_stats", "winning_probability",
-                            "top_batsmen_strike_rate", "highest_targets_set", "player_vs_team_stats",
-                            "overall_team_performance", "live_match_prediction", "batsman_vs_bowler_stats",
-                            "choose_the_best"]:
+if st.session_state.page in PAGES:
     st.markdown('<div style="margin-top: 20px;">', unsafe_allow_html=True)
     st.subheader(st.session_state.page.replace("_", " ").title())
     
@@ -242,29 +200,17 @@ if st.session_state.page in ["team_vs_team_growth", "bowler_comparison", "season
         st.rerun()
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # Render the selected feature
-    if st.session_state.page == "team_vs_team_growth":
-        team_vs_team_growth(matches, teams, deliveries, seasons)
-    elif st.session_state.page == "bowler_comparison":
-        bowler_comparison(deliveries, matches, players)
-    elif st.session_state.page == "season_stats":
-        season_stats(merged_df, bowler_data, matches, teams, players, seasons)
-    elif st.session_state.page == "winning_probability":
-        winning_probability(matches, teams)
-    elif st.session_state.page == "top_batsmen_strike_rate":
-        top_batsmen_strike_rate(deliveries)
-    elif st.session_state.page == "highest_targets_set":
-        highest_targets_set(matches)
-    elif st.session_state.page == "player_vs_team_stats":
-        player_vs_team_stats(merged_df, bowler_data, players, teams)
-    elif st.session_state.page == "overall_team_performance":
-        overall_team_performance(matches, teams)
-    elif st.session_state.page == "live_match_prediction":
-        live_match_prediction(matches, deliveries, teams, venues)
-    elif st.session_state.page == "batsman_vs_bowler_stats":
-        batsman_vs_bowler_stats(matches, deliveries, players, teams, venues, seasons)
-    elif st.session_state.page == "choose_the_best":
-        choose_the_best(matches, deliveries, players, seasons)
+    # Render the selected feature, importing its module and building its datasets on first use
+    debug = st.sidebar.checkbox("Show timings", key="debug_timings")
+    start_run(st.session_state.page, trace_memory=debug)
+    try:
+        with phase('page'):
+            render_page(st.session_state.page, debug)
+    finally:
+        write_run_log()
+    if debug:
+        st.sidebar.dataframe(run_records())
+        st.sidebar.dataframe(cache_stats())
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -0,0 +1,21 @@
+from cube import rollup, add_totals
+
+MATCHUP_KEYS = ['batter', 'bowler', 'season', 'venue']
+MATCHUP_MEASURES = ['runs', 'balls', 'deliveries', 'dismissals', 'fours', 'sixes']
+
+def build_matchup_index(cube):
+    # One row per (batter, bowler, season, venue) with the totals the matchup pages need,
+    # rolled up from the aggregate cube and sorted so a (batter, bowler) pair is a binary
+    # search into the MultiIndex
+    return rollup(cube, MATCHUP_KEYS, MATCHUP_MEASURES).sort_index()
+
+def append_matchup_index(index, batch_cube):
+    # The index after adding the cube cells of a batch of deliveries
+    return add_totals(index, build_matchup_index(batch_cube))
+
+def matchup(index, batter, bowler):
+    # Season/venue rows for one (batter, bowler) pair, empty if they never met
+    try:
+        return index.loc[(batter, bowler)]
+    except KeyError:
+        return index.iloc[0:0].droplevel(['batter', 'bowler'])
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+import numpy as np
+import pandas as pd
+from data_store import store_lock, wait_for_writer
+from team_form import team_form_as_of, team_win_rate_as_of, calculate_player_form
+
+# Bump when the contents or layout of the artifacts change so old ones are rebuilt
+ARTIFACT_VERSION = 1
+ARTIFACT_DIR = './data/artifacts'
+MODEL_FILE = 'model.json'
+MATCH_DATA_FILE = 'match_data.parquet'
+
+WEATHER_CONDITIONS = ['Clear', 'Rainy', 'Humid']
+# Fixed seed for the simulated weather so the same data always yields the same artifacts
+WEATHER_SEED = 2008
+
+def create_mapping(values):
+    unique_values = sorted(list(set(values)))
+    return {val: idx for idx, val in enumerate(unique_values)}
+
+def data_fingerprint(matches, deliveries):
+    # Content hash of the frames the model is built from, plus everything else that shapes the artifacts
+    digest = hashlib.sha256(f'{ARTIFACT_VERSION}:{WEATHER_SEED}'.encode())
+    for df in [matches, deliveries]:
+        digest.update(','.join(df.columns).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def build_prediction_artifacts(matches, deliveries, team_form_log, player_forms=None):
+    # player_forms optionally carries forms already known for some teams; only the rest are computed
+    known_forms = player_forms or {}
+    match_data = matches.copy()
+    for col in ['team1', 'team2', 'winner', 'city']:
+        match_data[col] = match_data[col].astype(object).str.strip()
+
+    # Create mappings for teams, cities, and weather
+    all_teams = pd.concat([match_data['team1'], match_data['team2']]).dropna().unique()
+    team_mapping = create_mapping(all_teams)
+    city_mapping = create_mapping(match_data['city'].fillna('Unknown'))
+    weather_mapping = create_mapping(WEATHER_CONDITIONS)
+
+    match_data['team1_encoded'] = match_data['team1'].map(team_mapping)
+    match_data['team2_encoded'] = match_data['team2'].map(team_mapping)
+    match_data['city_encoded'] = match_data['city'].fillna('Unknown').map(city_mapping)
+
+    # Historical win rate and recent form for every team in one pass over the form log
+    win_rates = team_win_rate_as_of(team_form_log, all_teams)
+    form_win_rates, avg_runs, avg_wickets = team_form_as_of(team_form_log, all_teams)
+
+    # Player form for each team
+    player_forms = {}
+    for team in all_teams:
+        if team in known_forms:
+            player_forms[team] = known_forms[team]
+            continue
+        batting_form, bowling_form, _, _ = calculate_player_form(team, deliveries, match_data)
+        player_forms[team] = [float(batting_form), float(bowling_form)]
+
+    # Simulate weather impact
+    rng = np.random.default_rng(WEATHER_SEED)
+    match_data['weather'] = rng.choice(WEATHER_CONDITIONS, size=len(match_data))
+    match_data['weather_encoded'] = match_data['weather'].map(weather_mapping)
+
+    return {
+        'match_data': match_data,
+        'team_mapping': team_mapping,
+        'city_mapping': city_mapping,
+        'weather_mapping': weather_mapping,
+        'team_wins': {team: float(rate) for team, rate in zip(all_teams, win_rates)},
+        'team_forms': {
+            team: [float(w), float(r), float(k)]
+            for team, w, r, k in zip(all_teams, form_win_rates, avg_runs, avg_wickets)
+        },
+        'player_forms': player_forms
+    }
+
+def append_prediction_artifacts(artifacts, matches, deliveries, team_form_log, batch_matches):
+    # Artifacts after a batch of matches was added to matches/deliveries. Mappings, win rates and
+    # team form come from the small matches table and form log; the per-team player form, which
+    # scans the deliveries, is recomputed only for the teams that played in the batch.
+    played = set(pd.concat([batch_matches['team1'], batch_matches['team2']]).dropna().astype(object).str.strip())
+    known_forms = {team: form for team, form in artifacts['player_forms'].items() if team not in played}
+    return build_prediction_artifacts(matches, deliveries, team_form_log, known_forms)
+
+def read_artifacts(artifact_dir):
+    with open(os.path.join(artifact_dir, MODEL_FILE)) as f:
+        artifacts = json.load(f)
+    if artifacts.pop('version', None) != ARTIFACT_VERSION:
+        raise ValueError(f"stale prediction artifacts in {artifact_dir}")
+    artifacts['match_data'] = pd.read_parquet(os.path.join(artifact_dir, MATCH_DATA_FILE))
+    return artifacts
+
+def write_artifacts(artifact_dir, artifacts):
+    # Same approach as the data store so readers never see a partial artifact: each writer fills
+    # a temporary directory of its own, then under the lock the old directory is renamed aside
+    # and the new one renamed in
+    root = os.path.dirname(os.path.abspath(artifact_dir))
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=root, prefix=f'{os.path.basename(artifact_dir)}.tmp-')
+    try:
+        os.chmod(tmp_dir, 0o755)
+        artifacts['match_data'].to_parquet(os.path.join(tmp_dir, MATCH_DATA_FILE), index=False)
+        model = {name: value for name, value in artifacts.items() if name != 'match_data'}
+        with open(os.path.join(tmp_dir, MODEL_FILE), 'w') as f:
+            json.dump({'version': ARTIFACT_VERSION, **model}, f)
+        old_dir = f'{artifact_dir}.old-{uuid.uuid4().hex}'
+        with store_lock(artifact_dir):
+            if os.path.exists(artifact_dir):
+                os.replace(artifact_dir, old_dir)
+            os.replace(tmp_dir, artifact_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def prune_artifacts(root, keep):
+    # Remove the artifact directories of every other fingerprint, superseded by keep. Temporary,
+    # renamed-aside and lock directories of writers still at work are left alone.
+    for name in os.listdir(root):
+        if name != keep and len(name) == len(keep) and all(c in '0123456789abcdef' for c in name):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def load_prediction_artifacts(matches, deliveries, team_form_log, root=ARTIFACT_DIR):
+    # Artifacts live under a directory named after the data fingerprint, so a data change
+    # simply misses and rebuilds while every replica sharing the directory starts warm
+    artifact_dir = os.path.join(root, data_fingerprint(matches, deliveries))
+    try:
+        return read_artifacts(artifact_dir)
+    except (OSError, ValueError):
+        pass
+    # Another replica may be swapping the same artifacts in right now
+    if wait_for_writer(artifact_dir):
+        try:
+            return read_artifacts(artifact_dir)
+        except (OSError, ValueError):
+            pass
+    artifacts = build_prediction_artifacts(matches, deliveries, team_form_log)
+    try:
+        write_artifacts(artifact_dir, artifacts)
+    except OSError:
+        pass  # Read-only deployments still work, they just rebuild on every cold start
+    return artifacts
+
+def save_prediction_artifacts(matches, deliveries, artifacts, root=ARTIFACT_DIR):
+    # Store artifacts built incrementally where load_prediction_artifacts looks for this data,
+    # so the next cold start finds them, and drop those of the data before the append
+    fingerprint = data_fingerprint(matches, deliveries)
+    try:
+        write_artifacts(os.path.join(root, fingerprint), artifacts)
+        prune_artifacts(root, fingerprint)
+    except OSError:
+        pass
@@ -0,0 +1,65 @@
+import importlib
+
+# Feature pages in dashboard order: button label, the module holding the render function (named
+# after the page) and the datasets it takes, in call order. Modules are imported on first visit.
+PAGES = {
+    'team_vs_team_growth': {
+        'label': "Team vs Team Growth",
+        'module': 'features.team_vs_team_growth',
+        'datasets': ['matches', 'teams', 'deliveries', 'season_index', 'seasons', 'franchises']
+    },
+    'bowler_comparison': {
+        'label': "Bowler Comparison",
+        'module': 'features.bowler_comparison',
+        'datasets': ['cube', 'players']
+    },
+    'season_stats': {
+        'label': "Season Stats",
+        'module': 'features.season_stats',
+        'datasets': ['deliveries', 'matches', 'teams', 'players', 'seasons', 'player_index', 'season_index', 'innings', 'cube']
+    },
+    'winning_probability': {
+        'label': "Winning Probability",
+        'module': 'features.winning_probability',
+        'datasets': ['matches', 'teams', 'franchises']
+    },
+    'top_batsmen_strike_rate': {
+        'label': "Top Batsmen Strike Rate",
+        'module': 'features.top_batsmen_strike_rate',
+        'datasets': ['leaderboards', 'seasons']
+    },
+    'highest_targets_set': {
+        'label': "Highest Targets Set",
+        'module': 'features.highest_targets_set',
+        'datasets': ['matches']
+    },
+    'player_vs_team_stats': {
+        'label': "Player vs Team Stats",
+        'module': 'features.player_vs_team_stats',
+        'datasets': ['innings', 'players', 'teams']
+    },
+    'overall_team_performance': {
+        'label': "Overall Team Performance",
+        'module': 'features.overall_team_performance',
+        'datasets': ['standings', 'franchises', 'seasons']
+    },
+    'live_match_prediction': {
+        'label': "Live Match Prediction",
+        'module': 'features.live_match_prediction',
+        'datasets': ['matches', 'deliveries', 'teams', 'venues', 'team_form_log', 'win_model']
+    },
+    'batsman_vs_bowler_stats': {
+        'label': "Batsman vs Bowler Stats",
+        'module': 'features.batsman_vs_bowler_stats',
+        'datasets': ['matchup_index', 'players', 'teams', 'venues', 'seasons']
+    },
+    'choose_the_best': {
+        'label': "Choose the Best",
+        'module': 'features.choose_the_best',
+        'datasets': ['matchup_index', 'players', 'seasons'],
+        'button_key': 'choose_the_best_button'
+    }
+}
+
+def page_renderer(page):
+    return getattr(importlib.import_module(PAGES[page]['module']), page)
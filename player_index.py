@@ -0,0 +1,64 @@
+import numpy as np
+
+def build_player_index(deliveries, column):
+    # Row positions sorted by player code, plus start/end offsets for every player (CSR layout)
+    player_col = deliveries[column]
+    codes = player_col.cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable').astype(np.int32)
+    # Missing players carry code -1 and sort to the front, drop them
+    order = order[np.count_nonzero(codes < 0):]
+    counts = np.bincount(codes[codes >= 0], minlength=len(player_col.cat.categories))
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return {
+        'column': column,
+        'categories': player_col.cat.categories,
+        'order': order,
+        'offsets': offsets
+    }
+
+def build_player_indexes(deliveries):
+    return {column: build_player_index(deliveries, column) for column in ['batter', 'bowler']}
+
+def append_player_index(index, deliveries, start):
+    # The index after rows from start on were appended to deliveries. Each player's block keeps
+    # their existing rows and gains their new ones after them, so only the batch is sorted.
+    player_col = deliveries[index['column']]
+    categories = player_col.cat.categories
+    known = categories.get_indexer(index['categories'])
+    old_counts = np.diff(index['offsets'])
+    codes = player_col.cat.codes.to_numpy()[start:]
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    prior = np.zeros(len(categories), dtype=np.int64)
+    prior[known] = old_counts
+    offsets = np.zeros(len(categories) + 1, dtype=np.int64)
+    np.cumsum(prior + counts, out=offsets[1:])
+
+    order = np.empty(offsets[-1], dtype=np.int32)
+    # Existing rows move with their player's block
+    order[np.repeat(offsets[:-1][known] - index['offsets'][:-1], old_counts) + np.arange(len(index['order']))] = index['order']
+    # New rows fill the end of each block in row order
+    batch_order = np.argsort(codes, kind='stable')[np.count_nonzero(codes < 0):]
+    batch_codes = codes[batch_order]
+    rank = np.arange(len(batch_codes)) - np.searchsorted(batch_codes, batch_codes, side='left')
+    order[offsets[batch_codes] + prior[batch_codes] + rank] = batch_order + start
+    return {
+        'column': index['column'],
+        'categories': categories,
+        'order': order,
+        'offsets': offsets
+    }
+
+def append_player_indexes(indexes, deliveries, start):
+    return {column: append_player_index(index, deliveries, start) for column, index in indexes.items()}
+
+def player_deliveries(player, df, index=None, column='batter'):
+    # O(1) offset lookup when df is the frame the index was built on, otherwise a single scan
+    if index is None:
+        return df[df[column] == player]
+    try:
+        code = index['categories'].get_loc(player)
+    except KeyError:
+        return df.iloc[0:0]
+    start, end = index['offsets'][code], index['offsets'][code + 1]
+    return df.iloc[index['order'][start:end]]
@@ -0,0 +1,97 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 600  # seconds
+
+# Every cached query in the process, by qualified name, for stats and clearing
+query_caches = {}
+# Bumped whenever the process datasets change (see new_dataset_generation), so results computed
+# from the datasets before the change are neither served nor stored afterwards
+dataset_generation = {'value': 0}
+
+def cache_key(arguments, generation):
+    # The query inputs (player names, teams, seasons, thresholds) form the key. Frames and
+    # dict-of-frame indexes are the process-wide datasets, identical for every caller, so they
+    # are keyed by identity and the dataset generation rather than hashed on every call: a
+    # caller still holding datasets from before an append never shares entries with current ones.
+    def part(value):
+        return tuple(value) if isinstance(value, list) else value
+    def dataset(value):
+        return isinstance(value, (pd.DataFrame, pd.Series, dict))
+    return (generation,) + tuple(
+        (name, id(value)) if dataset(value) else (name, part(value)) for name, value in arguments.items()
+    )
+
+def cached_query(maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+    # Process-wide memo for a pure page computation, shared by every session, with LRU eviction
+    # past maxsize entries and expiry ttl seconds after an entry was computed. Cached results
+    # are shared objects: callers must treat them as read-only.
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        entries = OrderedDict()
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Bind to the signature so positional, keyword and defaulted calls share entries
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            generation = dataset_generation['value']
+            key = cache_key(bound.arguments, generation)
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if now - entry[0] < ttl:
+                        entries.move_to_end(key)
+                        stats['hits'] += 1
+                        return entry[1]
+                    del entries[key]
+                    stats['expirations'] += 1
+                stats['misses'] += 1
+            # Compute outside the lock so slow queries don't block other keys
+            result = fn(*args, **kwargs)
+            with lock:
+                if dataset_generation['value'] != generation:
+                    # The datasets changed while computing: the result may reflect the old ones
+                    return result
+                entries[key] = (time.monotonic(), result)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+                    stats['evictions'] += 1
+            return result
+
+        def cache_info():
+            with lock:
+                return {**stats, 'size': len(entries), 'maxsize': maxsize, 'ttl': ttl}
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        query_caches[f'{fn.__module__}.{fn.__qualname__}'] = wrapper
+        return wrapper
+    return decorator
+
+def cache_stats():
+    # One row per cached query, e.g. for a debug table
+    return [{'query': name, **query.cache_info()} for name, query in query_caches.items()]
+
+def clear_query_caches():
+    for query in query_caches.values():
+        query.cache_clear()
+
+def new_dataset_generation():
+    # Called after the process datasets change: earlier results are dropped, and queries still
+    # computing from the previous datasets will not store theirs
+    dataset_generation['value'] += 1
+    clear_query_caches()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import numpy as np
+
+SCORECARD_KEYS = ['match_id', 'inning']
+
+def build_scorecards(deliveries, match_ids=None):
+    # Innings totals plus batting and bowling cards for any number of matches, each built in
+    # one grouped pass over (match, inning, player) and indexed by (match_id, inning)
+    if match_ids is not None:
+        deliveries = deliveries[deliveries['match_id'].isin(match_ids)]
+    flags = deliveries[SCORECARD_KEYS + ['batting_team', 'batter', 'bowler', 'batsman_runs', 'total_runs', 'is_wicket']].assign(
+        legal_ball=deliveries['extras_type'].ne('wides').astype('int32'),
+        batsman_runs=deliveries['batsman_runs'].astype('int32'),
+        total_runs=deliveries['total_runs'].astype('int32'),
+        is_wicket=deliveries['is_wicket'].astype('int32')
+    )
+
+    innings = flags.groupby(SCORECARD_KEYS).agg(
+        batting_team=('batting_team', 'first'),
+        total_runs=('total_runs', 'sum'),
+        wickets=('is_wicket', 'sum'),
+        balls=('legal_ball', 'sum')
+    )
+    innings['overs'] = innings['balls'] // 6 + (innings['balls'] % 6) / 10
+
+    batting = flags.groupby(SCORECARD_KEYS + ['batter'], observed=True).agg(
+        runs=('batsman_runs', 'sum'),
+        balls=('legal_ball', 'sum')
+    ).reset_index(level='batter')
+    batting['strike_rate'] = (batting['runs'] / batting['balls'] * 100).round(2).replace([np.inf, -np.inf], 0)
+
+    bowling = flags.groupby(SCORECARD_KEYS + ['bowler'], observed=True).agg(
+        runs_conceded=('total_runs', 'sum'),
+        wickets=('is_wicket', 'sum'),
+        balls=('legal_ball', 'sum')
+    ).reset_index(level='bowler')
+    bowling['overs'] = (bowling['balls'] // 6 + (bowling['balls'] % 6) / 10).round(2)
+    bowling['economy'] = (bowling['runs_conceded'] / (bowling['balls'] / 6)).round(2).replace([np.inf, -np.inf], 0)
+
+    return {'innings': innings, 'batting': batting, 'bowling': bowling}
+
+def innings_card(scorecards, match_id, inning):
+    # (innings totals, batting card, bowling card) for one innings, totals None if it was not played
+    key = (match_id, inning)
+    if key not in scorecards['innings'].index:
+        return None, None, None
+    return (
+        scorecards['innings'].loc[key],
+        scorecards['batting'].loc[[key]].reset_index(drop=True),
+        scorecards['bowling'].loc[[key]].reset_index(drop=True)
+    )
+
+def export_scorecards(scorecards, out_dir):
+    # One CSV per card type, keyed by match_id and inning
+    os.makedirs(out_dir, exist_ok=True)
+    for name, card in scorecards.items():
+        card.to_csv(os.path.join(out_dir, f'{name}.csv'))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export every scorecard of a season as CSV")
+    parser.add_argument('season', help="Season to export, e.g. 2019")
+    parser.add_argument('--out', default='scorecards', help="Output directory")
+    args = parser.parse_args()
+
+    from ingest import read_frames
+    # Only the season's partition is read
+    frames = read_frames(['matches', 'deliveries'], seasons=[args.season])
+    matches = frames['matches']
+    season_ids = matches.loc[matches['season'] == args.season, 'id']
+    if season_ids.empty:
+        parser.error(f"no matches found for season {args.season}")
+    export_scorecards(build_scorecards(frames['deliveries'], season_ids), args.out)
+    print(f"Wrote {len(season_ids)} matches to {args.out}")
@@ -0,0 +1,22 @@
+import numpy as np
+
+def build_season_index(df):
+    # Start/stop row of every season in a frame laid out season by season, as read from the
+    # partitioned store, so a season filter is a slice instead of a scan
+    codes = df['season'].cat.codes.to_numpy()
+    seasons = np.arange(len(df['season'].cat.categories))
+    return {
+        'categories': df['season'].cat.categories,
+        'starts': np.searchsorted(codes, seasons, side='left'),
+        'stops': np.searchsorted(codes, seasons, side='right')
+    }
+
+def build_season_indexes(frames):
+    return {name: build_season_index(frames[name]) for name in ['matches', 'deliveries']}
+
+def season_rows(df, index, season):
+    # The rows of one season (empty for a season without any)
+    position = index['categories'].get_indexer([season])[0]
+    if position < 0:
+        return df.iloc[0:0]
+    return df.iloc[index['starts'][position]:index['stops'][position]]
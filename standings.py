@@ -0,0 +1,54 @@
+import pandas as pd
+from franchises import NO_TEAM
+from cube import add_totals
+
+STANDINGS_KEYS = ['code', 'season', 'venue']
+STANDINGS_COLUMNS = ['played', 'won', 'lost', 'tied', 'no_result', 'win_pct']
+
+def build_standings(matches):
+    # One row per (franchise code, season, venue) with match outcome counts, built from a long
+    # table holding both sides of every fixture so each team is counted in a single groupby.
+    # Keyed by the codes assigned at ingest, so renamed sides count towards one franchise.
+    sides = [
+        pd.DataFrame({
+            'code': matches[f'{side}_code'],
+            'season': matches['season'].astype(object),
+            'venue': matches['venue'].astype(object),
+            'won': (matches['winner_code'] == matches[f'{side}_code']).astype('int64'),
+            'tied': (matches['result'] == 'tie').astype('int64'),
+            'no_result': (matches['winner_code'] == NO_TEAM).astype('int64')
+        })
+        for side in ['team1', 'team2']
+    ]
+    long = pd.concat(sides, ignore_index=True)
+    long = long[long['code'] != NO_TEAM]
+    table = long.groupby(STANDINGS_KEYS, dropna=False).agg(
+        played=('won', 'size'),
+        won=('won', 'sum'),
+        tied=('tied', 'sum'),
+        no_result=('no_result', 'sum')
+    )
+    return table.astype('int64').sort_index()
+
+def append_standings(table, matches):
+    # The table after adding a batch of matches: only the batch is counted
+    return add_totals(table, build_standings(matches))
+
+def standings(table, franchises, by=None, season=None, venue=None, teams=None):
+    # Roll the materialized counts up to one row per franchise, under its current name from the
+    # lineage table (or per franchise and each key in by), optionally restricted to one season
+    # and/or venue.
+    if season is not None:
+        table = table[table.index.get_level_values('season') == season]
+    if venue is not None:
+        table = table[table.index.get_level_values('venue') == venue]
+    levels = ['code'] + list(by or [])
+    totals = table.groupby(level=levels, dropna=False).sum()
+    names = franchises.groupby('code')['franchise'].first()
+    totals = totals.rename(index=names, level='code').rename_axis(index={'code': 'team'})
+    if teams is not None and not by:
+        totals = totals.reindex(teams, fill_value=0)
+    # Ties and no-results are taken out of the losses even when a super over decided a winner
+    totals['lost'] = totals['played'] - totals['won'] - totals['tied'] - totals['no_result']
+    totals['win_pct'] = (totals['won'] / totals['played'].where(totals['played'] > 0) * 100).round(2).fillna(0)
+    return totals[STANDINGS_COLUMNS]
@@ -0,0 +1,198 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Shift applied to match ids of each extra copy of the fixture list
+ID_STRIDE = 2_000_000
+PLAYERS_PER_TEAM = 25
+MAX_LEGAL_BALLS = 120
+BOWLERS_PER_INNINGS = 5
+
+# Per-delivery outcome model, roughly matching IPL rates
+EXTRAS = [None, 'wides', 'noballs', 'legbyes', 'byes']
+EXTRA_THRESHOLDS = [0.04, 0.05, 0.07, 0.08]
+RUN_VALUES = [0, 1, 2, 3, 4, 6]
+RUN_PROBABILITIES = [0.35, 0.35, 0.07, 0.01, 0.15, 0.07]
+WICKET_PROBABILITY = 0.05
+DISMISSAL_KINDS = ['caught', 'bowled', 'lbw', 'run out', 'stumped', 'caught and bowled', 'hit wicket']
+FIELDED_KINDS = ['caught', 'run out', 'stumped']
+
+DELIVERY_COLUMNS = [
+    'match_id', 'inning', 'batting_team', 'bowling_team', 'over', 'ball', 'batter', 'bowler', 'non_striker',
+    'batsman_runs', 'extra_runs', 'total_runs', 'extras_type', 'is_wicket', 'player_dismissed', 'dismissal_kind', 'fielder'
+]
+
+def scale_fixtures(template, scale):
+    # The real fixture list repeated scale times; copies keep seasons, dates and venues but get new ids
+    copies = []
+    for copy in range(scale):
+        fixtures = template.copy()
+        fixtures['id'] = fixtures['id'] + copy * ID_STRIDE
+        copies.append(fixtures)
+    return pd.concat(copies, ignore_index=True)
+
+def roster_names(teams, roster_size):
+    # Player names per team: team initials plus a squad number, e.g. MI_P7
+    return np.array([
+        f"{''.join(word[0] for word in team.split())}_P{number}"
+        for team in teams
+        for number in range(roster_size)
+    ], dtype=object)
+
+def simulate_innings(rng, batting_codes, bowling_codes, targets, roster_size):
+    # Play every innings at once, one delivery per step for the innings still in progress.
+    # Returns per-delivery arrays in chronological order within each innings, plus innings totals.
+    n = len(batting_codes)
+    bat_start = rng.integers(0, roster_size, n)
+    bowl_start = rng.integers(0, roster_size, n)
+    striker = np.zeros(n, dtype=np.int64)
+    non_striker = np.ones(n, dtype=np.int64)
+    next_in = np.full(n, 2, dtype=np.int64)
+    legal = np.zeros(n, dtype=np.int64)
+    ball_in_over = np.ones(n, dtype=np.int64)
+    wickets = np.zeros(n, dtype=np.int64)
+    runs = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    steps = []
+    while active.any():
+        idx = np.flatnonzero(active)
+        size = len(idx)
+        extra = np.searchsorted(EXTRA_THRESHOLDS, rng.random(size), side='right')
+        extra = np.where(extra < len(EXTRA_THRESHOLDS), extra + 1, 0)
+        no_bat_runs = np.isin(extra, [EXTRAS.index('wides'), EXTRAS.index('legbyes'), EXTRAS.index('byes')])
+        batsman_runs = np.where(no_bat_runs, 0, rng.choice(RUN_VALUES, size=size, p=RUN_PROBABILITIES))
+        extra_runs = (extra > 0).astype(np.int64)
+        is_wicket = (extra != EXTRAS.index('wides')) & (rng.random(size) < WICKET_PROBABILITY)
+        over = legal[idx] // 6
+        steps.append({
+            'innings': idx,
+            'over': over,
+            'ball': ball_in_over[idx],
+            'batter': (bat_start[idx] + striker[idx]) % roster_size,
+            'non_striker': (bat_start[idx] + non_striker[idx]) % roster_size,
+            'bowler': (bowl_start[idx] + over % BOWLERS_PER_INNINGS) % roster_size,
+            'batsman_runs': batsman_runs,
+            'extra_runs': extra_runs,
+            'extras_type': extra,
+            'is_wicket': is_wicket,
+            'dismissal_kind': rng.integers(0, len(DISMISSAL_KINDS), size),
+            'fielder': rng.integers(0, roster_size, size)
+        })
+
+        runs[idx] += batsman_runs + extra_runs
+        is_legal = ~np.isin(extra, [EXTRAS.index('wides'), EXTRAS.index('noballs')])
+        legal[idx] += is_legal
+        ball_in_over[idx] += 1
+        wickets[idx] += is_wicket
+        # The next batter in replaces a dismissed striker
+        out = idx[is_wicket]
+        striker[out] = next_in[out]
+        next_in[out] += 1
+        # Odd runs and the end of an over both change the strike
+        for swap in [idx[batsman_runs % 2 == 1], idx[is_legal & (legal[idx] % 6 == 0)]]:
+            striker[swap], non_striker[swap] = non_striker[swap], striker[swap]
+        end_of_over = idx[is_legal & (legal[idx] % 6 == 0)]
+        ball_in_over[end_of_over] = 1
+        active[idx] = (legal[idx] < MAX_LEGAL_BALLS) & (wickets[idx] < 10) & (runs[idx] < targets[idx])
+
+    balls = {col: np.concatenate([step[col] for step in steps]) for col in steps[0]}
+    order = np.argsort(balls['innings'], kind='stable')
+    balls = {col: values[order] for col, values in balls.items()}
+    return balls, runs, wickets
+
+def generate(template, scale=1, seed=0, roster_size=None):
+    # Synthetic matches and deliveries on the real fixture list, with results recomputed from
+    # the simulated innings so targets, winners and margins agree with the ball-by-ball data
+    rng = np.random.default_rng(seed)
+    roster_size = roster_size or int(PLAYERS_PER_TEAM * scale ** 0.5)
+    matches = scale_fixtures(template, scale)
+    teams = sorted(set(matches['team1']) | set(matches['team2']))
+    team_codes = {team: code for code, team in enumerate(teams)}
+    team_names = np.array(teams, dtype=object)
+    players = roster_names(teams, roster_size)
+
+    # No-result fixtures stay without deliveries
+    played = matches[matches['winner'].notna()]
+    team1 = played['team1'].map(team_codes).to_numpy()
+    team2 = played['team2'].map(team_codes).to_numpy()
+    toss_team1 = (played['toss_winner'] == played['team1']).to_numpy()
+    bat_first = (played['toss_decision'] == 'bat').to_numpy() == toss_team1
+    first = np.where(bat_first, team1, team2)
+    second = np.where(bat_first, team2, team1)
+
+    first_balls, first_runs, _ = simulate_innings(rng, first, second, np.full(len(played), np.inf), roster_size)
+    target = first_runs + 1
+    second_balls, second_runs, second_wickets = simulate_innings(rng, second, first, target, roster_size)
+
+    frames = []
+    for inning, balls, batting, bowling in [(1, first_balls, first, second), (2, second_balls, second, first)]:
+        innings = balls['innings']
+        bat_team, bowl_team = batting[innings], bowling[innings]
+        kind = np.array(DISMISSAL_KINDS, dtype=object)[balls['dismissal_kind']]
+        fielded = balls['is_wicket'] & np.isin(kind, FIELDED_KINDS)
+        frames.append(pd.DataFrame({
+            'match_id': played['id'].to_numpy()[innings],
+            'inning': inning,
+            'batting_team': team_names[bat_team],
+            'bowling_team': team_names[bowl_team],
+            'over': balls['over'],
+            'ball': balls['ball'],
+            'batter': players[bat_team * roster_size + balls['batter']],
+            'bowler': players[bowl_team * roster_size + balls['bowler']],
+            'non_striker': players[bat_team * roster_size + balls['non_striker']],
+            'batsman_runs': balls['batsman_runs'],
+            'extra_runs': balls['extra_runs'],
+            'total_runs': balls['batsman_runs'] + balls['extra_runs'],
+            'extras_type': np.array(EXTRAS, dtype=object)[balls['extras_type']],
+            'is_wicket': balls['is_wicket'].astype(int),
+            'player_dismissed': np.where(balls['is_wicket'], players[bat_team * roster_size + balls['batter']], None),
+            'dismissal_kind': np.where(balls['is_wicket'], kind, None),
+            'fielder': np.where(fielded, players[bowl_team * roster_size + balls['fielder']], None)
+        }))
+    deliveries = pd.concat(frames, ignore_index=True)
+    deliveries = deliveries.sort_values(['match_id', 'inning'], kind='stable')[DELIVERY_COLUMNS]
+
+    # Results follow the simulated scores
+    chased = second_runs >= target
+    tied = second_runs == first_runs
+    # A tie goes to either side, standing in for the super over
+    super_over_winner = np.where(rng.random(len(played)) < 0.5, first, second)
+    winner = np.where(chased, second, np.where(tied, super_over_winner, first))
+    results = pd.DataFrame({
+        'winner': team_names[winner],
+        'result': np.where(chased, 'wickets', np.where(tied, 'tie', 'runs')),
+        'result_margin': np.where(chased, 10 - second_wickets, np.where(tied, np.nan, first_runs - second_runs)),
+        'target_runs': target,
+        'target_overs': 20.0,
+        'super_over': np.where(tied, 'Y', 'N'),
+        'method': None
+    }, index=played.index)
+    matches.loc[played.index, results.columns] = results
+    batter_runs = deliveries.groupby(['match_id', 'batter'])['batsman_runs'].sum()
+    top_scorer = batter_runs.groupby(level='match_id').idxmax().str[1]
+    matches.loc[played.index, 'player_of_match'] = played['id'].map(top_scorer).to_numpy()
+    return matches, deliveries
+
+def dataset_dir(scale, root='bench_data'):
+    return os.path.join(root, f'x{scale}')
+
+def write_dataset(out_dir, matches, deliveries):
+    data_dir = os.path.join(out_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    matches.to_csv(os.path.join(data_dir, 'matches.csv'), index=False)
+    deliveries.to_csv(os.path.join(data_dir, 'deliveries.csv'), index=False)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic IPL matches and ball-by-ball deliveries")
+    parser.add_argument('--scale', type=int, default=1, help="Multiple of the real fixture history (1, 10, 100, ...)")
+    parser.add_argument('--out', help="Directory to write data/matches.csv and data/deliveries.csv into (default: bench_data/x<scale>)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--template', default='./data/matches.csv', help="Real fixture list to build on")
+    args = parser.parse_args()
+
+    out_dir = args.out or dataset_dir(args.scale)
+    matches, deliveries = generate(pd.read_csv(args.template), args.scale, args.seed)
+    write_dataset(out_dir, matches, deliveries)
+    print(f"Wrote {len(matches)} matches and {len(deliveries)} deliveries to {os.path.join(out_dir, 'data')}")
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# Room for every day since the epoch below each team code in the composite sort key
+DAY_BITS = 32
+
+def team_match_rows(matches, deliveries):
+    # Innings totals per (match, team), computed once from the ball-by-ball table
+    runs = deliveries.groupby(['match_id', 'batting_team'], observed=True)['total_runs'].sum()
+    wickets = deliveries.groupby(['match_id', 'bowling_team'], observed=True)['is_wicket'].sum()
+    runs.index = runs.index.set_levels(runs.index.levels[1].astype(object), level=1)
+    wickets.index = wickets.index.set_levels(wickets.index.levels[1].astype(object), level=1)
+
+    # One row per (team, match) for both sides of every fixture
+    days = (pd.to_datetime(matches['date']) - pd.Timestamp('1970-01-01')).dt.days.to_numpy()
+    sides = [
+        pd.DataFrame({
+            'team': matches[side].astype(object).to_numpy(),
+            'match_id': matches['id'].to_numpy(),
+            'day': days,
+            'won': (matches['winner'].astype(object) == matches[side].astype(object)).to_numpy()
+        })
+        for side in ['team1', 'team2']
+    ]
+    log = pd.concat(sides, ignore_index=True)
+    log = log[log['team'].notna()]
+    team_match = pd.MultiIndex.from_arrays([log['match_id'], log['team']])
+    log['runs'] = runs.reindex(team_match).fillna(0).to_numpy()
+    log['wickets'] = wickets.reindex(team_match).fillna(0).to_numpy()
+    return log
+
+def index_team_match_rows(log):
+    # Sort by (team, date) so each team's history is one block and "as of" is a binary search
+    teams = pd.Index(sorted(log['team'].unique()))
+    codes = teams.get_indexer(log['team'])
+    order = np.lexsort((log['match_id'].to_numpy(), log['day'].to_numpy(), codes))
+    codes = codes[order].astype(np.int64)
+    keys = (codes << DAY_BITS) + log['day'].to_numpy()[order]
+    prefix = {}
+    for col in ['won', 'runs', 'wickets']:
+        prefix[col] = np.concatenate([[0], np.cumsum(log[col].to_numpy()[order], dtype=np.float64)])
+    return {
+        'teams': teams,
+        'keys': keys,
+        'match_ids': log['match_id'].to_numpy()[order],
+        'team_start': np.searchsorted(codes, np.arange(len(teams))),
+        'prefix': prefix
+    }
+
+def build_team_form_log(matches, deliveries):
+    return index_team_match_rows(team_match_rows(matches, deliveries))
+
+def append_team_form_log(form_log, matches, deliveries):
+    # The log after adding a batch of matches and their deliveries: the existing rows are read
+    # back from the sort keys and prefix sums, so only the batch's deliveries are aggregated
+    existing = pd.DataFrame({
+        'team': form_log['teams'][form_log['keys'] >> DAY_BITS],
+        'match_id': form_log['match_ids'],
+        'day': form_log['keys'] & ((1 << DAY_BITS) - 1),
+        **{col: np.diff(prefix) for col, prefix in form_log['prefix'].items()}
+    })
+    existing['won'] = existing['won'].astype(bool)
+    return index_team_match_rows(pd.concat([existing, team_match_rows(matches, deliveries)], ignore_index=True))
+
+def window_totals(form_log, teams, as_of=None, n_matches=None):
+    # Summed wins, runs and wickets over each team's last n matches before as_of (all of them when
+    # n_matches is None), plus how many matches the window covered
+    codes = form_log['teams'].get_indexer(pd.Index(np.atleast_1d(teams)))
+    known = codes >= 0
+    safe_codes = np.where(known, codes, 0).astype(np.int64)
+    if as_of is None:
+        days = np.full(len(codes), (1 << DAY_BITS) - 1, dtype=np.int64)
+    else:
+        as_of = pd.to_datetime(pd.Series(np.broadcast_to(as_of, len(codes))))
+        days = (as_of - pd.Timestamp('1970-01-01')).dt.days.to_numpy()
+    end = np.searchsorted(form_log['keys'], (safe_codes << DAY_BITS) + days, side='left')
+    start = form_log['team_start'][safe_codes]
+    if n_matches is not None:
+        start = np.maximum(end - n_matches, start)
+    totals = {col: np.where(known, prefix[end] - prefix[start], 0) for col, prefix in form_log['prefix'].items()}
+    totals['played'] = np.where(known, end - start, 0)
+    return totals
+
+def team_form_as_of(form_log, teams, as_of=None, n_matches=5):
+    # Win rate, average runs and average wickets over each team's last n matches played
+    # strictly before as_of (or over its latest matches when as_of is None), for many teams at once
+    totals = window_totals(form_log, teams, as_of, n_matches)
+    divisor = n_matches if n_matches > 0 else 1
+    return totals['won'] / divisor, totals['runs'] / divisor, totals['wickets'] / divisor
+
+def team_win_rate_as_of(form_log, teams, as_of=None):
+    # Overall win rate before as_of, 0.5 for teams with no matches yet
+    totals = window_totals(form_log, teams, as_of)
+    return np.divide(totals['won'], totals['played'], out=np.full(len(totals['played']), 0.5), where=totals['played'] > 0)
+
+def player_innings_rows(deliveries):
+    # Batting and bowling totals per (team, match, player), the additive parts of player form
+    batting = deliveries.assign(legal_ball=deliveries['extras_type'].ne('wides')).groupby(['batting_team', 'match_id', 'batter'], observed=True).agg(
+        runs=('batsman_runs', 'sum'),
+        balls=('legal_ball', 'sum')
+    ).reset_index()
+    bowling = deliveries.groupby(['bowling_team', 'match_id', 'bowler'], observed=True).agg(
+        wickets=('is_wicket', 'sum'),
+        runs_conceded=('total_runs', 'sum'),
+        balls=('ball', 'count')
+    ).reset_index()
+    return batting, bowling
+
+def player_form(batting, bowling, n_matches=5):
+    # Batting and bowling form of a team's top players from its innings rows over a window of
+    # matches; the sorts are stable so players tied on runs or wickets are always taken in the same order
+
+    # Batting form: Top 5 run-scorers
+    batting_stats = batting.groupby('batter', observed=True).agg(
+        runs=('runs', 'sum'),
+        balls=('balls', 'sum')
+    ).reset_index()
+    batting_stats['strike_rate'] = (batting_stats['runs'] / batting_stats['balls'] * 100).replace([np.inf, -np.inf], 0)
+    top_batsmen = batting_stats.sort_values(by='runs', ascending=False, kind='stable').head(5)
+    avg_batting_form = top_batsmen['strike_rate'].mean() if not top_batsmen.empty else 0
+
+    # Bowling form: Top 5 wicket-takers
+    bowling_stats = bowling.groupby('bowler', observed=True).agg(
+        wickets=('wickets', 'sum'),
+        runs_conceded=('runs_conceded', 'sum'),
+        balls=('balls', 'sum')
+    ).reset_index()
+    bowling_stats['economy'] = (bowling_stats['runs_conceded'] / (bowling_stats['balls'] / 6)).replace([np.inf, -np.inf], 0)
+    top_bowlers = bowling_stats.sort_values(by='wickets', ascending=False, kind='stable').head(5)
+    avg_bowling_form = top_bowlers['wickets'].sum() / n_matches if not top_bowlers.empty else 0
+
+    return avg_batting_form, avg_bowling_form, top_batsmen, top_bowlers
+
+def calculate_player_form(team, deliveries, matches, n_matches=5):
+    # Batting and bowling form of a team's top players over its last n matches
+    team_matches = matches[(matches['team1'] == team) | (matches['team2'] == team)].sort_values(by='date', ascending=False).head(n_matches)
+    match_ids = team_matches['id'].values
+    batting, bowling = player_innings_rows(deliveries[deliveries['match_id'].isin(match_ids)])
+    return player_form(batting[batting['batting_team'] == team], bowling[bowling['bowling_team'] == team], n_matches)
+
+def build_player_form_log(deliveries):
+    # Innings rows of every (team, match) with the row positions of each, so the rows of a
+    # team's window of matches are gathered without scanning the deliveries
+    batting, bowling = player_innings_rows(deliveries)
+    return {
+        'batting': batting,
+        'bowling': bowling,
+        'batting_rows': batting.groupby(['batting_team', 'match_id'], observed=True).indices,
+        'bowling_rows': bowling.groupby(['bowling_team', 'match_id'], observed=True).indices
+    }
+
+def player_form_as_of(form_log, player_log, team, as_of=None, n_matches=5):
+    # calculate_player_form over the team's last n matches played strictly before as_of: the
+    # window comes from the team form log's sorted keys, its rows from the player form log
+    codes = form_log['teams'].get_indexer([team])
+    match_ids = []
+    if codes[0] >= 0:
+        code = np.int64(codes[0])
+        day = (1 << DAY_BITS) - 1 if as_of is None else (pd.Timestamp(as_of) - pd.Timestamp('1970-01-01')).days
+        end = np.searchsorted(form_log['keys'], (code << DAY_BITS) + day, side='left')
+        start = max(end - n_matches, form_log['team_start'][code])
+        match_ids = form_log['match_ids'][start:end]
+    none = np.array([], dtype=np.int64)
+    batting_rows = np.concatenate([player_log['batting_rows'].get((team, match_id), none) for match_id in match_ids] + [none])
+    bowling_rows = np.concatenate([player_log['bowling_rows'].get((team, match_id), none) for match_id in match_ids] + [none])
+    return player_form(player_log['batting'].iloc[batting_rows], player_log['bowling'].iloc[bowling_rows], n_matches)
@@ -1,23 +1,21 @@
-import pandas as pd
-
-def get_batsman_statistics(batsman, df, matches):
-    if not batsman or df[df['batter'] == batsman].empty:
+def get_batsman_statistics(batsman, innings, matches):
+    # innings: the batter's rows from the batting innings table, already filtered
+    if not batsman or innings is None or innings.empty:
         return {}
-    batsman_df = df[df['batter'] == batsman]
-    total_runs = batsman_df['batsman_runs'].sum()
-    total_balls = batsman_df[batsman_df['extras_type'].ne('wides')]['ball'].count()
-    dismissals = batsman_df['is_wicket'].sum()
-    innings = batsman_df['match_id'].nunique()
-    fours = batsman_df[batsman_df['batsman_runs'] == 4]['ball'].count()
-    sixes = batsman_df[batsman_df['batsman_runs'] == 6]['ball'].count()
-    fifties = (batsman_df.groupby('match_id')['batsman_runs'].sum() >= 50).sum()
-    centuries = (batsman_df.groupby('match_id')['batsman_runs'].sum() >= 100).sum()
-    highest_score = batsman_df.groupby('match_id')['batsman_runs'].sum().max()
-    not_outs = innings - dismissals
-    mom = matches[(matches['player_of_match'] == batsman) & (matches['season'].isin(df['season']))].shape[0]
+    total_runs = innings['runs'].sum()
+    total_balls = innings['balls'].sum()
+    dismissals = innings['dismissed'].sum()
+    innings_count = len(innings)
+    fours = innings['fours'].sum()
+    sixes = innings['sixes'].sum()
+    fifties = (innings['runs'] >= 50).sum()
+    centuries = (innings['runs'] >= 100).sum()
+    highest_score = innings['runs'].max()
+    not_outs = innings_count - dismissals
+    mom = matches[(matches['player_of_match'] == batsman) & (matches['season'].isin(innings['season']))].shape[0]
     return {
         'player_name': batsman,
-        'total_innings': innings,
+        'total_innings': innings_count,
         'total_runs': int(total_runs),
         'total_fours': int(fours),
         'total_sixes': int(sixes),
@@ -30,28 +28,27 @@ def get_batsman_statistics(batsman, df, matches):
         'player_of_the_match_awards': int(mom)
     }
 
-def get_bowler_statistics(bowler, df, matches):
-    if not bowler or df[df['bowler'] == bowler].empty:
+def get_bowler_statistics(bowler, innings, matches):
+    # innings: the bowler's rows from the bowling innings table, already filtered
+    if not bowler or innings is None or innings.empty:
         return {}
-    bowler_df = df[df['bowler'] == bowler]
-    wickets = bowler_df['isBowlerWicket'].sum()
-    runs_given = bowler_df['bowler_run'].sum()
-    balls = bowler_df['ball'].count()
-    innings = bowler_df['match_id'].nunique()
+    wickets = innings['wickets'].sum()
+    runs_given = innings['runs_conceded'].sum()
+    balls = innings['balls'].sum()
+    innings_count = len(innings)
     overs = balls / 6
-    fours = bowler_df[bowler_df['batsman_runs'] == 4]['ball'].count()
-    sixes = bowler_df[bowler_df['batsman_runs'] == 6]['ball'].count()
-    match_wickets = bowler_df.groupby('match_id')['isBowlerWicket'].sum()
+    fours = innings['fours'].sum()
+    sixes = innings['sixes'].sum()
+    match_wickets = innings['wickets']
     best_wickets = match_wickets.max()
-    best_match_ids = match_wickets[match_wickets == best_wickets].index
-    best_runs = bowler_df[bowler_df['match_id'].isin(best_match_ids)]['bowler_run'].sum()
+    best_runs = innings.loc[match_wickets == best_wickets, 'runs_conceded'].sum()
     three_w = (match_wickets >= 3).sum()
     four_w = (match_wickets >= 4).sum()
     five_w = (match_wickets >= 5).sum()
-    mom = matches[(matches['player_of_match'] == bowler) & (matches['season'].isin(df['season']))].shape[0]
+    mom = matches[(matches['player_of_match'] == bowler) & (matches['season'].isin(innings['season']))].shape[0]
     return {
         'bowler': bowler,
-        'innings': int(innings),
+        'innings': int(innings_count),
         'wickets': int(wickets),
         'economy': round(runs_given / overs, 2) if overs > 0 else 0,
         'average': round(runs_given / wickets, 2) if wickets > 0 else 'N/A',
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Contribution of each factor to the batting side's win probability
+MODEL_WEIGHTS = {
+    'history': 0.3,
+    'team_form': 0.2,
+    'player_form': 0.2,
+    'match_situation': 0.2,
+    'external': 0.1
+}
+
+def build_win_model(team_wins, team_forms, player_forms, matches):
+    # Per-team factor table plus (team, city) home pairs so states can be scored as arrays
+    teams = pd.Index(sorted(set(team_wins) | set(team_forms) | set(player_forms)))
+    table = pd.DataFrame({
+        'hist_win_rate': [team_wins.get(team, 0.5) for team in teams],
+        'form_win_rate': [team_forms[team][0] if team in team_forms else 0 for team in teams],
+        'batting_form': [player_forms[team][0] if team in player_forms else 0 for team in teams],
+        'bowling_form': [player_forms[team][1] if team in player_forms else 0 for team in teams]
+    }, index=teams)
+    home = matches[['team1', 'city']].dropna().astype(object).drop_duplicates()
+    return {
+        'teams': table,
+        'home_pairs': pd.MultiIndex.from_frame(home)
+    }
+
+def share(a, b):
+    # a / (a + b), or an even split when both are zero
+    total = a + b
+    return np.divide(a, total, out=np.full(np.shape(total), 0.5), where=total > 0)
+
+def head_to_head(a, b):
+    # normalize(a, min(a, b), max(a, b)) from the original scalar model
+    return np.where(a > b, 1.0, np.where(a < b, 0.0, 0.5))
+
+def team_factors(model, batting_teams, bowling_teams, cities, weather='Clear', weights=MODEL_WEIGHTS):
+    # The weighted parts of the batting side's win probability that stay fixed through an innings:
+    # history, team form and player form (base), and home ground plus weather (external)
+    batting_teams = np.asarray(batting_teams, dtype=object)
+    size = len(batting_teams)
+    bowling_teams = np.broadcast_to(np.asarray(bowling_teams, dtype=object), size)
+    cities = np.broadcast_to(np.asarray(cities, dtype=object), size)
+    rainy = np.broadcast_to(np.asarray(weather, dtype=object) == 'Rainy', size)
+
+    table = model['teams']
+    team1 = table.reindex(batting_teams)
+    team2 = table.reindex(bowling_teams)
+
+    # Historical win rate and recent team form
+    hist_factor = share(team1['hist_win_rate'].fillna(0.5).to_numpy(), team2['hist_win_rate'].fillna(0.5).to_numpy())
+    form_factor = share(team1['form_win_rate'].fillna(0).to_numpy(), team2['form_win_rate'].fillna(0).to_numpy())
+
+    # Player form
+    batting_form_factor = head_to_head(team1['batting_form'].fillna(0).to_numpy(), team2['batting_form'].fillna(0).to_numpy())
+    bowling_form_factor = head_to_head(team1['bowling_form'].fillna(0).to_numpy(), team2['bowling_form'].fillna(0).to_numpy())
+    player_form_factor = batting_form_factor * 0.5 + bowling_form_factor * 0.5
+
+    # Weather and home advantage
+    home_advantage = np.where(pd.MultiIndex.from_arrays([batting_teams, cities]).isin(model['home_pairs']), 0.55, 0.45)
+    weather_factor = np.where(rainy, 0.55, 0.5)
+    external_factor = home_advantage * 0.5 + weather_factor * 0.5
+
+    return {
+        'base': hist_factor * weights['history'] + form_factor * weights['team_form'] + player_form_factor * weights['player_form'],
+        'external': external_factor * weights['external'],
+        'rainy': np.asarray(rainy)
+    }
+
+def situation_probabilities(factors, scores, overs, wickets_out, targets, weights=MODEL_WEIGHTS):
+    # Batting and bowling side probabilities from fixed team factors plus the match situation,
+    # after the end-of-chase and rain adjustments
+    size = len(factors['base'])
+    scores = np.broadcast_to(np.asarray(scores, dtype=float), size)
+    overs = np.broadcast_to(np.asarray(overs, dtype=float), size)
+    wickets_out = np.broadcast_to(np.asarray(wickets_out, dtype=float), size)
+    targets = np.broadcast_to(np.asarray(targets, dtype=float), size)
+
+    # Match situation
+    run_rate = np.divide(scores, overs, out=np.zeros(size), where=overs > 0)
+    required_run_rate = np.divide(targets - scores, 20 - overs, out=np.zeros(size), where=overs < 20)
+    wickets_remaining = 10 - wickets_out
+    match_situation_factor = (run_rate / 10) * 0.4 + (1 - required_run_rate / 15) * 0.4 + (wickets_remaining / 10) * 0.2
+
+    team1_prob = factors['base'] + match_situation_factor * weights['match_situation'] + factors['external']
+    team1_prob = np.clip(team1_prob, 0.0, 1.0)
+
+    # Chase is over: the result is decided by the score alone
+    finished = (overs >= 20) | (wickets_out >= 10)
+    team1_prob = np.where(finished, np.where(scores >= targets, 1.0, 0.0), team1_prob)
+    # Rain gives the batting side a slight boost
+    team1_prob = np.where(factors['rainy'], np.minimum(1.0, team1_prob * 1.1), team1_prob)
+    team2_prob = np.maximum(0.0, 1.0 - team1_prob)
+    return team1_prob, team2_prob
+
+def predict_probabilities(model, batting_teams, bowling_teams, cities, scores, overs, wickets_out, targets, weather='Clear', weights=MODEL_WEIGHTS):
+    # Score many (batting team, bowling team, city, score, overs, wickets, target) states in one pass.
+    # Returns the batting and bowling side probabilities after the end-of-chase and rain adjustments.
+    factors = team_factors(model, batting_teams, bowling_teams, cities, weather, weights)
+    return situation_probabilities(factors, scores, overs, wickets_out, targets, weights)
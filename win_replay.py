@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from win_model import MODEL_WEIGHTS, predict_probabilities
+
+def build_chase_states(matches, deliveries, match_ids=None):
+    # Match state after every delivery of the second innings, for any number of matches at once
+    chase = deliveries[deliveries['inning'] == 2]
+    first_innings = deliveries[deliveries['inning'] == 1]
+    if match_ids is not None:
+        chase = chase[chase['match_id'].isin(match_ids)]
+        first_innings = first_innings[first_innings['match_id'].isin(match_ids)]
+    by_match = chase['match_id']
+
+    # Running totals per match (widen first: per-ball columns are int8)
+    score = chase['total_runs'].astype('int32').groupby(by_match).cumsum()
+    wickets = chase['is_wicket'].astype('int32').groupby(by_match).cumsum()
+    legal_balls = (~chase['extras_type'].isin(['wides', 'noballs'])).astype('int32').groupby(by_match).cumsum()
+
+    # Target from matches, falling back to the first-innings total + 1 when it is missing
+    match_info = matches.set_index('id')
+    target = by_match.map(match_info['target_runs'])
+    first_innings_total = first_innings['total_runs'].astype('int32').groupby(first_innings['match_id']).sum()
+    target = target.fillna(by_match.map(first_innings_total + 1))
+
+    return pd.DataFrame({
+        'match_id': by_match,
+        'delivery': by_match.groupby(by_match).cumcount() + 1,
+        'over': chase['over'],
+        'ball': chase['ball'],
+        'batting_team': chase['batting_team'].astype(object),
+        'bowling_team': chase['bowling_team'].astype(object),
+        'city': by_match.map(match_info['city'].astype(object)),
+        'score': score,
+        'wickets': wickets,
+        'overs': legal_balls / 6,
+        'target': target
+    }).reset_index(drop=True)
+
+def score_chase_states(win_model, states, weights=MODEL_WEIGHTS):
+    # Add the chasing and defending side win probabilities to a frame of chase states
+    chasing_prob, defending_prob = predict_probabilities(
+        win_model,
+        states['batting_team'].to_numpy(),
+        states['bowling_team'].to_numpy(),
+        states['city'].to_numpy(),
+        states['score'].to_numpy(),
+        states['overs'].to_numpy(),
+        states['wickets'].to_numpy(),
+        states['target'].to_numpy(),
+        weights=weights
+    )
+    # Once the target is reached the chase is won, whatever the overs and wickets
+    reached = (states['score'] >= states['target']).to_numpy()
+    states = states.copy()
+    states['chasing_win_prob'] = np.where(reached, 1.0, chasing_prob)
+    states['defending_win_prob'] = np.where(reached, 0.0, defending_prob)
+    return states
+
+def replay_win_probability(win_model, matches, deliveries, match_ids=None, weights=MODEL_WEIGHTS):
+    # Win-probability curve of the chasing side for every second-innings delivery of the given matches
+    return score_chase_states(win_model, build_chase_states(matches, deliveries, match_ids), weights)